@@ -1,6 +1,5 @@
 import pygame
 from pygame.sprite import Sprite
-from pygame import mixer
 
 class Alien(Sprite):
     """A class to represent a single alien in the fleet."""
@@ -13,7 +12,7 @@ class Alien(Sprite):
         self.bullets = bullets
 
         # Load the alien image and set its rect attribure.
-        self.image = pygame.image.load(ai_game.resource_path("assets/images/alien.bmp"))
+        self.image = ai_game.assets.image("assets/images/alien.bmp")
         self.rect = self.image.get_rect()
 
         # Start each new alien newr the top left of the screen.
@@ -23,9 +22,8 @@ class Alien(Sprite):
         # Store the alien's exact horizontal position.
         self.x = float(self.rect.x)
 
-        # Initiate mixer and Load The sound of hit
-        mixer.init()
-        self.hit_sound = mixer.Sound(ai_game.resource_path("assets/sounds/explosion.wav"))
+        # Load The sound of hit.
+        self.hit_sound = ai_game.assets.sound("assets/sounds/explosion.wav")
 
 
     def check_edges(self):
@@ -35,7 +33,11 @@ class Alien(Sprite):
 
     def update(self):
         """Move the alien to the right and left."""
-        self.x += self.settings.alien_speed * self.settings.fleet_direction
+        self.x += (
+            self.settings.alien_speed
+            * self.settings.time_step
+            * self.settings.fleet_direction
+        )
         self.rect.x = self.x
 
 
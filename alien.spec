@@ -1,4 +1,16 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+
+# Decoding the assets needs no sound card.
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, SPECPATH)
+from asset_bundle import build
+
+# The bundle is written beside the executable rather than into it: a
+#   one-file executable unpacks everything it holds on every start, and
+#   the game memory-maps the bundle where it is.
+build(os.path.join(SPECPATH, "assets"), os.path.join(DISTPATH, "assets.bundle"))
 
 
 block_cipher = None
@@ -8,7 +20,8 @@ a = Analysis(
     ['alien_invasion.py'],
     pathex=[],
     binaries=[],
-    datas=[('assets', 'assets/')],
+    # Only the old high score file is left to import from the loose assets.
+    datas=[('assets/high_score', 'assets')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,165 @@
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy the projectiles are moved and tested one by one.
+    np = None
+
+
+class AlienFire:
+    """
+    A class to fire, move, draw and collide every alien projectile at once.
+
+    The projectile positions are kept in two contiguous arrays with the
+    projectiles in use at the front, like the bullet pool.
+    """
+
+    def __init__(self, ai_game):
+        """Create the projectile arrays and the image every projectile uses."""
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.rng = ai_game.rng
+        self.fleet = ai_game.fleet
+
+        self.width = self.settings.alien_projectile_width
+        self.height = self.settings.alien_projectile_height
+        self.image = pygame.Surface((self.width, self.height), 0, self.screen)
+        self.image.fill(self.settings.alien_projectile_color)
+
+        # Float64 arrays move the projectiles exactly like Python floats, so
+        #   both engines play the same game.
+        self.capacity = self.settings.alien_projectiles_allowed
+        self.vectorized = np is not None and self.settings.vectorized_projectiles
+        if self.vectorized:
+            self.xs = np.zeros(self.capacity)
+            self.ys = np.zeros(self.capacity)
+        else:
+            self.xs = [0.0] * self.capacity
+            self.ys = [0.0] * self.capacity
+        self.active = 0
+
+        # The simulation time of the next volley, in ms.
+        self.next_volley = 0
+        self.fired = 0
+        self.peak = 0
+
+    def __len__(self):
+        return self.active
+
+    def reset(self, now):
+        """Remove every projectile and wait a full interval for the next volley."""
+        self.active = 0
+        self.next_volley = now + self.settings.alien_fire_interval
+
+    def spawn(self, x, y):
+        """Add a projectile centered on x with its top at y, if there is room."""
+        if self.active == self.capacity:
+            return False
+        self.xs[self.active] = x - self.width / 2
+        self.ys[self.active] = y
+        self.active += 1
+        self.fired += 1
+        self.peak = max(self.peak, self.active)
+        return True
+
+    def fire(self, aliens, now):
+        """Let a volley of random aliens fire if it is time to."""
+        if now < self.next_volley or not aliens:
+            return
+        self.next_volley = now + self.settings.alien_fire_interval
+        sprites = aliens.sprites()
+        for shot in range(min(self.settings.alien_volley_size, len(sprites))):
+            alien = self.rng.choice(sprites)
+            if self.fleet:
+                self.fleet.sync_rect(alien)
+            self.spawn(alien.rect.centerx, alien.rect.bottom)
+
+    def update(self):
+        """Move the projectiles down and free the ones below the screen."""
+        count = self.active
+        if not count:
+            return
+        dy = self.settings.alien_projectile_speed * self.settings.time_step
+        bottom = self.settings.screen_height
+
+        if self.vectorized:
+            ys = self.ys[:count]
+            ys += dy
+            keep = ys < bottom
+            kept = int(np.count_nonzero(keep))
+            if kept < count:
+                self.xs[:kept] = self.xs[:count][keep]
+                self.ys[:kept] = ys[keep]
+        else:
+            xs, ys = self.xs, self.ys
+            kept = 0
+            for index in range(count):
+                y = ys[index] + dy
+                if y < bottom:
+                    xs[kept] = xs[index]
+                    ys[kept] = y
+                    kept += 1
+        self.active = kept
+
+    def collides(self, rect):
+        """Return True if any projectile overlaps rect."""
+        count = self.active
+        if not count:
+            return False
+        left = rect.left - self.width
+        top = rect.top - self.height
+
+        if self.vectorized:
+            xs = self.xs[:count]
+            ys = self.ys[:count]
+            return bool(
+                np.any(
+                    (ys > top) & (ys < rect.bottom) & (xs > left) & (xs < rect.right)
+                )
+            )
+        return any(
+            top < y < rect.bottom and left < x < rect.right
+            for x, y in zip(self.xs[:count], self.ys[:count])
+        )
+
+    def blit_items(self, dy=0):
+        """Return the (image, rect) pairs of the projectiles, dy pixels below them."""
+        count = self.active
+        if self.vectorized:
+            xs = self.xs[:count].astype(int).tolist()
+            ys = (self.ys[:count] + dy).astype(int).tolist()
+        else:
+            xs = [int(x) for x in self.xs[:count]]
+            ys = [int(y + dy) for y in self.ys[:count]]
+        image, width, height = self.image, self.width, self.height
+        return [(image, (x, y, width, height)) for x, y in zip(xs, ys)]
+
+    def nearest(self, x, y):
+        """Return the center of the projectile nearest to (x, y), or None."""
+        count = self.active
+        if not count:
+            return None
+        half_width, half_height = self.width / 2, self.height / 2
+
+        if self.vectorized:
+            xs = self.xs[:count] + half_width
+            ys = self.ys[:count] + half_height
+            index = int(np.argmin((xs - x) ** 2 + (ys - y) ** 2))
+            return float(xs[index]), float(ys[index])
+        return min(
+            (
+                (px + half_width, py + half_height)
+                for px, py in zip(self.xs[:count], self.ys[:count])
+            ),
+            key=lambda center: (center[0] - x) ** 2 + (center[1] - y) ** 2,
+        )
+
+    def stats(self):
+        """Return the number of projectiles in use, the peak and the total fired."""
+        return {
+            "capacity": self.capacity,
+            "active": self.active,
+            "peak": self.peak,
+            "fired": self.fired,
+        }
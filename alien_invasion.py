@@ -1,7 +1,13 @@
+from functools import partial
+from time import perf_counter
+
+# Time the imports too, for the startup report.
+STARTED = perf_counter()
+
 import sys
-from time import sleep
-from pathlib import Path
+import argparse
 import os
+import random
 import sys
 
 
@@ -9,43 +15,165 @@ import pygame
 from pygame import mixer
 
 from settings import Settings
+from game_state import GameState
+from sound_bank import SoundBank
+from asset_cache import AssetCache
+from asset_bundle import MIXER_FORMAT
+from font_registry import FontRegistry
+from score_store import ScoreStore
 from game_stats import GameStats
 from scoreboard import Scoreboard
 from button import Button
 from ship import Ship
-from bullet import Bullet
+from bullet import BulletPool
 from alien import Alien
-from explosion import Explosion
+from alien_fire import AlienFire
+from fleet import Fleet, FleetBounds
+from collision import CollisionIndex
+from explosion import ExplosionPool
 from ship_explosion import Explosion as Ship_explosion
+from dirty_rects import DirtyRects
+from screen_scaler import ScreenScaler
+from frame_profiler import FrameProfiler
+from frame_pacer import FramePacer
+from replay import InputRecorder, InputPlayer
+from input_handler import InputHandler
+from startup_timer import StartupTimer
 
 
 class AlienInvasion:
     """Overall class to manage game assets and behavior."""
 
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        pygame.init()
+    def __init__(
+        self,
+        headless=False,
+        size=None,
+        render=True,
+        seed=None,
+        windowed=False,
+        display_size=None,
+    ):
+        """
+        Initialize the game, and create game resources.
+
+        A headless game uses the SDL dummy video and audio drivers and plays
+        no sound; it is driven by step() instead of run_game(). size opens
+        a window of that size and plays at that resolution, and render=False
+        makes step() skip drawing. windowed plays in a window instead of
+        fullscreen. display_size opens a window of that size and scales the
+        logical resolution to it. seed seeds the game's random generator.
+        """
+        self.headless = headless
+        self.render = render
+        self.startup = StartupTimer(STARTED)
+        self.startup.lap("imports")
+
+        # Initialize only the pygame modules the game uses.
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        pygame.display.init()
+        pygame.font.init()
+        InputHandler.allow_events()
+        if not headless:
+            # Without an audio device every sound is silent; a headless
+            #   game leaves the mixer uninitialized on purpose.
+            # The sounds in the asset bundle are decoded for MIXER_FORMAT.
+            try:
+                mixer.init(*MIXER_FORMAT, allowedchanges=0)
+            except pygame.error:
+                pass
         self.clock = pygame.time.Clock()
+        # The simulation clock in ms, advanced by every fixed time step.
+        self.now = 0
+        self.step_motion = (0, 0, 0, 0)
         self.settings = Settings()
 
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        self.settings.screen_width = self.screen.get_rect().width
-        self.settings.screen_height = self.screen.get_rect().height
+        # Every random choice of the game comes from this generator, so a
+        #   recording only has to store its seed.
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.recorder = None
+        self.player = None
+
+        if size is None and display_size is None and headless:
+            size = (self.settings.screen_width, self.settings.screen_height)
+        if size is not None:
+            display = pygame.display.set_mode(size)
+            self.settings.screen_width, self.settings.screen_height = size
+        elif display_size is not None:
+            display = pygame.display.set_mode(display_size)
+        elif self.settings.fullscreen and not windowed:
+            display = self._open_fullscreen()
+        else:
+            display = pygame.display.set_mode(
+                (
+                    self.settings.screen_width * self.settings.window_scale,
+                    self.settings.screen_height * self.settings.window_scale,
+                )
+            )
         pygame.display.set_caption("Aien Invasion")
 
+        # Draw at the logical resolution, so the gameplay doesn't depend on
+        #   the display; unless SDL scales it already, scale it to the display.
+        self.scaler = ScreenScaler(
+            display,
+            (self.settings.screen_width, self.settings.screen_height),
+            self.settings.scale_mode,
+        )
+        self.screen = self.scaler.screen
+        self.startup.lap("display")
+
+        # Create the cache which loads every image and sound only once.
+        self.assets = AssetCache()
+        # Load every font once, when it is first used.
+        self.fonts = FontRegistry()
+
+        # The ship hit and next level sounds are decoded in the background
+        #   once the menu is on the screen.
+        self.ship_hit_sounds = SoundBank(
+            self, "assets/sounds/ship_hit_sounds", self.settings.sound_bank_max_bytes
+        )
+        self.next_level_sounds = SoundBank(
+            self, "assets/sounds/next_level_sounds", self.settings.sound_bank_max_bytes
+        )
+
+        # Open the leaderboards; a headless game doesn't touch the disk.
+        self.scores = ScoreStore(
+            False if headless else self.settings.score_store_path,
+            self.settings.leaderboard_size,
+            legacy_path=self.resource_path("assets/high_score"),
+            default_difficulty=self.settings.difficulty,
+        )
+
         # Create an instance to score game statistics,
         #   and create a scoreboard.
         self.stats = GameStats(self)
         self.sb = Scoreboard(self)
 
         self.ship = Ship(self)
-        self.bullets = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
+        self.bullets = BulletPool(self)
+        # The array fleet only moves the rects of these aliens when they
+        #   are looked at; the aliens property brings them all up to date.
+        self._aliens = pygame.sprite.Group()
 
-        self._create_fleet()
+        # Track the bounding box of the fleet instead of scanning every alien.
+        self.fleet_bounds = FleetBounds(self)
+
+        # Move the fleet with array operations if NumPy is installed.
+        if self.settings.vectorized_fleet and Fleet.available():
+            self.fleet = Fleet(self)
+        else:
+            self.fleet = None
+        # The fleet is created when the first game starts.
 
-        # Start Alien Invasion in an active state.
-        self.game_active = False
+        # Look up bullet-alien collisions in the fleet's grid.
+        self.collision_index = CollisionIndex(self)
+        # The aliens' projectiles.
+        self.alien_fire = AlienFire(self)
+
+        # Start Alien Invasion in the menu.
+        self.state = GameState()
 
         # Make the play button.
         self.play_button = Button(
@@ -60,24 +188,106 @@ class AlienInvasion:
             "Hard", (255, 0, 0), (224, 224, 224), 3
         )
 
-        # Create an sprite group to hold the Explosion objects.
-        self.explosions = pygame.sprite.Group()
+        # The explosions aren't needed in the menu; their sprite sheets are
+        #   loaded by _finish_startup().
+        self.explosions = None
+        self.ship_explosion = None
+        self.startup_finished = False
+        self.menu_shown_ms = None
+
+        # Time each phase of the main loop; F3 turns it on and off.
+        self.profiler = FrameProfiler(self)
+        # Wait for the frames, or for input in a static menu.
+        self.pacer = FramePacer(self)
+
+        # Respond to the keys through a key-binding table.
+        self.input = InputHandler(
+            on_press={
+                "right": partial(setattr, self.ship, "moving_right", True),
+                "left": partial(setattr, self.ship, "moving_left", True),
+                "fire": self._press_fire,
+                "play": self._start_game,
+                "quit": self._quit_game,
+                "profiler": self.profiler.toggle,
+            },
+            on_release={
+                "right": partial(setattr, self.ship, "moving_right", False),
+                "left": partial(setattr, self.ship, "moving_left", False),
+            },
+            on_click=self._check_click,
+            on_quit=self._quit_game,
+        )
+        # The simulation time when a held fire key fires again, in ms.
+        self.next_auto_fire = 0
+
+        # Push only the changed parts of the screen if it's turned on.
+        if self.settings.dirty_rect_rendering:
+            self.dirty_rects = DirtyRects(self)
+        else:
+            self.dirty_rects = None
+        self.startup.lap("assets")
+
+    def _open_fullscreen(self):
+        """
+        Open the display in fullscreen at the logical resolution, and let
+        SDL's renderer scale it, so a frame costs the same on any display.
+        """
+        # pygame scales with the nearest pixel unless this hint says not to.
+        if self.settings.scale_mode == "smooth":
+            os.environ.setdefault("SDL_RENDER_SCALE_QUALITY", "linear")
+        try:
+            return pygame.display.set_mode(
+                (self.settings.screen_width, self.settings.screen_height),
+                pygame.FULLSCREEN | pygame.SCALED,
+            )
+        except pygame.error:
+            # There is no renderer to scale with; the ScreenScaler does it.
+            return pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+
+    def _finish_startup(self):
+        """Load what the menu doesn't need, once the menu is on the screen."""
+        if self.startup_finished:
+            return
+        self.startup_finished = True
+
+        # Create a pool to recycle the Explosion objects.
+        self.explosions = ExplosionPool(self)
 
         # Create an ship_explosion instance.
         self.ship_explosion = Ship_explosion(
-            self, self.ship.rect.centerx, self.ship.rect.centery
+            self, self.ship.rect.centerx, self.ship.rect.centery, self.now
         )
 
+        # Decode the ship hit and next level sounds in the background.
+        self.ship_hit_sounds.start_loading()
+        self.next_level_sounds.start_loading()
+
+    def _print_startup_report(self):
+        """Print how long each phase of the startup took."""
+        print(self.startup.report())
+        print(f"menu shown after {self.menu_shown_ms:.1f} ms")
+
     def resource_path(self, relative_path):
         """This method returns the path of a file base on PyInstaller is
            running the game or not"""
-        try:
-            # PyInstaller create a temp folder and stores path in _MEIPASS
-            base_path = sys._MEIPASS
-        except Exception:
-            base_path = os.path.abspath(".")
-        
-        return os.path.join(base_path, relative_path)
+        return self.assets.resource_path(relative_path)
+
+    @property
+    def game_active(self):
+        """Return True unless the game is in the menu."""
+        return self.state.current != GameState.MENU
+
+    @property
+    def aliens(self):
+        """Return the group of aliens, with every rect where the alien is."""
+        if self.fleet:
+            self.fleet.sync_rects()
+        return self._aliens
+
+    @property
+    def alien_count(self):
+        """Return the number of aliens left in the fleet."""
+        return len(self._aliens)
 
     def _make_level_button(self, msg, color, text_color, position):
         """make a level button with this attributes."""
@@ -91,41 +301,177 @@ class AlienInvasion:
 
     def run_game(self):
         """Start the main loop for the game."""
+        step_ms = 1000 * self.settings.time_step
+        accumulator = 0.0
+        frame_ms = 0
+        profiler = self.profiler
+
+        # Show the menu first, then load the rest.
+        self._update_screen()
+        self.startup.lap("first_frame")
+        self.menu_shown_ms = 1000 * self.startup.elapsed()
+        self._finish_startup()
+        self.startup.lap("deferred_assets")
+        if self.settings.startup_report:
+            self._print_startup_report()
+
         while True:
+            profiler.begin_frame()
             self._check_events()
+            profiler.lap("events")
+
+            if self.player:
+                # A replay runs the recorded number of steps.
+                steps = self.player.steps
+            else:
+                # Run as many fixed steps as the real time since the last
+                #   frame allows, but don't fall further behind after a
+                #   slow frame.
+                accumulator += frame_ms
+                steps = 0
+                while (
+                    accumulator >= step_ms and steps < self.settings.max_catchup_steps
+                ):
+                    accumulator -= step_ms
+                    steps += 1
+                if steps == self.settings.max_catchup_steps:
+                    accumulator = min(accumulator, step_ms)
+            for step in range(steps):
+                self._step()
+            if self.recorder:
+                self.recorder.end_frame(steps)
+
+            self._update_screen(accumulator / step_ms)
+            self.input.shown()
+            profiler.lap("screen")
+            frame_ms = self.pacer.tick(self.clock, self._pacing_mode())
+            profiler.lap("tick")
+
+    def _pacing_mode(self):
+        """Return how to wait for the next frame."""
+        if self.player:
+            # A replay runs its recorded frames and never waits for input.
+            return "fast" if self.player.fast else "play"
+        if not self.game_active:
+            # The menu only changes on input, unless the profile is shown.
+            if self.settings.idle_menu and not self.profiler.enabled:
+                return "idle"
+            return "menu"
+        return "play"
+
+    def start_recording(self, path):
+        """Record the seed and the input of every frame to a file."""
+        self.recorder = InputRecorder(path, self)
+
+    def start_replay(self, path, fast=False):
+        """Play back a recording, as fast as possible if fast is True."""
+        self.player = InputPlayer(path, fast)
+        self.seed = self.player.seed
+        self.rng.seed(self.seed)
+
+    def step(self, actions=()):
+        """
+        Apply the actions, advance the game by one time step and return its
+        status. The actions are any of "left", "right", "fire" and "play".
+        """
+        if "play" in actions:
+            self._start_game()
+        self.ship.moving_left = "left" in actions
+        self.ship.moving_right = "right" in actions
+        if "fire" in actions:
+            self._fire_bullet()
 
-            if self.game_active:
-                self.ship.update()
-                self._update_bullets()
-                self._update_aliens()
-
-                # We update all explosions in the "explosions".
-                self.explosions.update()
-
-                # Update the ship_explosion.
-                self.ship_explosion.update(
-                    self.ship.rect.centerx, self.ship.rect.centery
-                )
-
+        self._step()
+        if self.render:
             self._update_screen()
-            self.clock.tick(self.settings.frame_rate)
+
+        return {
+            "score": self.stats.score,
+            "level": self.stats.level,
+            "ships_left": self.stats.ships_left,
+            "aliens": self.alien_count,
+            "game_active": self.game_active,
+        }
+
+    def _step(self):
+        """Advance the game by one fixed time step."""
+        # Every animation advances from the same clock value.
+        self.now += 1000 * self.settings.time_step
+        self.state.update(self.now)
+
+        if self.state.current == GameState.PLAYING:
+            self._auto_fire()
+            ship_x = self.ship.x
+            self.ship.update()
+            self.profiler.lap("ship")
+            self._update_bullets()
+            self._update_aliens()
+            self.profiler.lap("aliens")
+            # The aliens hold their fire once the ship was hit.
+            if self.state.current == GameState.PLAYING:
+                self._update_alien_fire()
+            self.profiler.lap("alien_fire")
+
+            # Remember how far things moved, to interpolate the rendering.
+            self.step_motion = (
+                self.ship.x - ship_x,
+                self.settings.alien_speed
+                * self.settings.time_step
+                * self.settings.fleet_direction,
+                -self.settings.bullet_speed * self.settings.time_step,
+                self.settings.alien_projectile_speed * self.settings.time_step,
+            )
+        if self.state.current != GameState.PLAYING:
+            # Nothing moves while the game waits, and a ship which was hit
+            #   or a new fleet jumps to its place instead of sliding there.
+            self.step_motion = (0, 0, 0, 0)
+
+        if self.game_active:
+            # Animations keep running while the game waits for a
+            #   respawn or a new level.
+            # We update all explosions in the "explosions".
+            self.explosions.update(self.now)
+            self.profiler.lap("explosions")
+
+            # Update the ship_explosion.
+            self.ship_explosion.update(
+                self.ship.rect.centerx, self.ship.rect.centery, self.now
+            )
+            self.profiler.lap("ship_explosion")
 
     def _check_events(self):
         """Respond to keypresses and mouse events."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                # Store the high_score in a file
-                self._save_high_score()
-                # Exit the game
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                self._check_keydown_events(event)
-            elif event.type == pygame.KEYUP:
-                self._check_keyup_events(event)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                self._check_level_button(mouse_pos)
-                self._check_play_button(mouse_pos)
+        if self.player:
+            events = self.player.next_frame()
+            if events is None:
+                # The recording has ended.
+                self._quit_game()
+            # The window can still be closed during a replay.
+            events += pygame.event.get(pygame.QUIT)
+        else:
+            waited = self.pacer.take_waited_events()
+            if waited:
+                # No input arrived before the wait returned.
+                self.input.arrived(self.pacer.waited_at)
+            events = waited + pygame.event.get()
+            if self.scaler.scaled:
+                events = [self._to_logical(event) for event in events]
+        if self.recorder:
+            self.recorder.record_events(events)
+        self.input.handle(events)
+
+    def _check_click(self, mouse_pos):
+        """Respond to a mouse click on the buttons."""
+        self._check_level_button(mouse_pos)
+        self._check_play_button(mouse_pos)
+
+    def _to_logical(self, event):
+        """Return an event with its mouse position on the logical screen."""
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return event
+        return pygame.event.Event(
+            event.type, button=event.button, pos=self.scaler.to_logical(event.pos)
+        )
 
     def _check_level_button(self, mouse_pos):
         """Check if player clicks on a level button."""
@@ -134,22 +480,21 @@ class AlienInvasion:
         normal_clicked = self.normal_button.rect.collidepoint(mouse_pos)
         hard_clicked = self.hard_button.rect.collidepoint(mouse_pos)
 
-        # Modify the Play button and change the speedup_scale based on user click.
+        # Modify the Play button and change the difficulty based on user click.
         if easy_clicked and not self.game_active:
-            self.play_button.text_color = self.easy_button.button_color
-            self.play_button._prep_msg("Play")
-            self.settings.speedup_scale *= 1
-            self.settings.score_scale *= 1
+            self._choose_difficulty("easy", self.easy_button)
         elif normal_clicked and not self.game_active:
-            self.play_button.text_color = self.normal_button.button_color
-            self.play_button._prep_msg("Play")
-            self.settings.speedup_scale *= 1.3
-            self.settings.score_scale *= 1.3
+            self._choose_difficulty("normal", self.normal_button)
         elif hard_clicked and not self.game_active:
-            self.play_button.text_color = self.hard_button.button_color
-            self.play_button._prep_msg("Play")
-            self.settings.speedup_scale *= 1.6
-            self.settings.score_scale *= 1.6
+            self._choose_difficulty("hard", self.hard_button)
+
+    def _choose_difficulty(self, difficulty, button):
+        """Switch to a difficulty and show its high score."""
+        self.play_button.text_color = button.button_color
+        self.play_button._prep_msg("Play")
+        self.settings.set_difficulty(difficulty)
+        self.stats.high_score = self.scores.high_score(difficulty)
+        self.sb.prep_high_score()
 
     def _check_play_button(self, mouse_pos):
         """Start a new gmae when the player clicks Play."""
@@ -167,59 +512,56 @@ class AlienInvasion:
             self.sb.prep_score()
             self.sb.prep_level()
             self.sb.prep_ships()
-            self.game_active = True
+            self.state.enter(GameState.PLAYING)
 
-            # Get rid of any remaining bullets and aliens.
-            self.bullets.empty()
-            self.aliens.empty()
+            self._finish_startup()
 
-            # Create a new fleet and center the ship.
-            self._create_fleet()
+            # Get rid of any remaining bullets, aliens and projectiles.
+            self.bullets.empty()
+            self._aliens.empty()
+            self.alien_fire.reset(self.now)
+
+            # Create a new fleet and center the ship; the first fleet
+            #   counts towards the startup time.
+            first_fleet = "fleet" not in self.startup.phases
+            self.startup.time_once("fleet", self._create_fleet)
+            if first_fleet and self.settings.startup_report:
+                print(self.startup.report(["fleet"]))
             self.ship.center_ship()
 
             # Hide the mouse cursor.
             pygame.mouse.set_visible(False)
 
-    def _check_keydown_events(self, event):
-        """Respond to keypresses."""
-        if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = True
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = True
-        elif event.key == pygame.K_q:
-            # Store the high_score in a file
-            self._save_high_score()
-            # Exit the game
-            sys.exit()
-        elif event.key == pygame.K_SPACE:
+    def _press_fire(self):
+        """Fire a bullet, and fire again later if the key is held down."""
+        self._fire_bullet()
+        self.next_auto_fire = self.now + self.settings.auto_fire_interval
+
+    def _auto_fire(self):
+        """Keep firing while the fire key is held down."""
+        if (
+            self.settings.auto_fire
+            and self.input.held("fire")
+            and self.now >= self.next_auto_fire
+        ):
             self._fire_bullet()
-        elif event.key == pygame.K_p:
-            self._start_game()
-
-    def _check_keyup_events(self, event):
-        """Respond to keypresses."""
-        if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = False
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = False
+            self.next_auto_fire = self.now + self.settings.auto_fire_interval
 
     def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        if len(self.bullets) < self.settings.bullets_allowed and self.game_active:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
-            # Play sound of the bullet.
-            new_bullet.bullet_sound.play()
+        """Take a bullet from the bullet pool and fire it."""
+        if (
+            len(self.bullets) < self.settings.bullets_allowed
+            and self.state.current == GameState.PLAYING
+        ):
+            if self.bullets.fire(self.ship.rect):
+                # Play sound of the bullet.
+                self.bullets.bullet_sound.play()
 
     def _update_bullets(self):
         """Update position of bullets and get rid of old bullets."""
-        # Update bullet positions.
+        # Update bullet positions and get rid of bullets that have disappeared.
         self.bullets.update()
-
-        # Get rid of bullets that have disappeard
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
+        self.profiler.lap("bullets")
 
         self._check_bullet_alien_collisions()
 
@@ -227,10 +569,11 @@ class AlienInvasion:
         """Respond to bullet-allien collisions."""
         # Check for any bullets that have hit aliens.
         # If so, get rid of the bullet and the alien.
-        collisions = pygame.sprite.groupcollide(self.bullets, self.aliens, False, True)
+        collisions = self.collision_index.collide(self.bullets, self._aliens)
 
         if collisions:
             for aliens in collisions.values():
+                self._remove_aliens(aliens)
                 self.stats.score += self.settings.alien_points * len(aliens)
 
                 # animation and sound of Explosion
@@ -239,9 +582,21 @@ class AlienInvasion:
             self.sb.prep_score()
             self.sb.check_high_score()
 
-        if not self.aliens:
+        self.profiler.lap("collisions")
+
+        if not self._aliens:
             self._start_new_level()
 
+    def _remove_aliens(self, aliens):
+        """Remove aliens which were shot down from the fleet."""
+        if self.fleet:
+            self.fleet.remove(aliens)
+        elif self.fleet_bounds.touches(
+            (alien.x for alien in aliens), (alien.rect.y for alien in aliens)
+        ):
+            # Only an alien on the bounding box can change it.
+            self.fleet_bounds.reset_from_sprites(self._aliens)
+
     def explosion_animation_and_sound(self, aliens):
         """
         In this method we Initiate an explosion instance for each alien
@@ -249,14 +604,14 @@ class AlienInvasion:
         We also play the sound of collide.
         """
         for alien in aliens:
-            explosion = Explosion(self, alien.rect.center)
-            self.explosions.add(explosion)
+            self.explosions.spawn(alien.rect.center, self.now)
             alien.hit_sound.play()
 
     def _start_new_level(self):
         """Start a new level if there are no aliens in the screen."""
-        # Destroy existing bullets and create new fleet.
+        # Destroy existing bullets and projectiles and create new fleet.
         self.bullets.empty()
+        self.alien_fire.reset(self.now)
         self._create_fleet()
         self.settings.increase_speed()
 
@@ -268,35 +623,60 @@ class AlienInvasion:
         self._play_next_level_sounds()
 
     def _play_next_level_sounds(self):
-        """play sounds when player goes next level and sleep for playing audio."""
-        self.next_level_sound = mixer.Sound(
-            self.ship._choose_a_random_sound_file(self.resource_path("assets/sounds/next_level_sounds"))
-        )
+        """play sounds when player goes next level and pause while it plays."""
+        self.next_level_sound = self.next_level_sounds.random_sound()
         self.next_level_sound.play()
-        sleep(self.next_level_sound.get_length())
+        self.state.enter(
+            GameState.LEVEL_TRANSITION,
+            self.now,
+            self.next_level_sound.get_length() * 1000,
+        )
 
     def _update_aliens(self):
         """Check if the fleet is at an edge, then update position."""
-        self._check_fleet_edges()
-        self.aliens.update()
-
-        # Look for alien-ship collisions.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
-            self._ship_hit()
+        if self.fleet:
+            self.fleet.update()
+        else:
+            self._check_fleet_edges()
+            self._aliens.update()
+            self.fleet_bounds.move(
+                self.settings.alien_speed
+                * self.settings.time_step
+                * self.settings.fleet_direction
+            )
+
+        # Look for alien-ship collisions, only testing every alien when the
+        #   ship is inside the fleet's bounding box.
+        if not self.fleet_bounds.empty and self.fleet_bounds.rect.colliderect(
+            self.ship.rect
+        ):
+            if self.fleet:
+                self.fleet.sync_rects()
+            if pygame.sprite.spritecollideany(self.ship, self._aliens):
+                self._ship_hit()
+                return
 
         # Look for aliens hitting the bottom of the screen.
         self._check_aliens_bottom()
 
+    def _update_alien_fire(self):
+        """Let the aliens fire, move their projectiles and check for hits."""
+        self.alien_fire.fire(self._aliens, self.now)
+        self.alien_fire.update()
+        if self.alien_fire.collides(self.ship.rect):
+            self._ship_hit()
+
     def _ship_hit(self):
-        """Respond to the ship being hit by an alien."""
+        """Respond to the ship being hit by an alien or a projectile."""
         if self.stats.ships_left > 0:
             # Decrement ships_left, and update scoreboard.
             self.stats.ships_left -= 1
             self.sb.prep_ships()
 
-            # Get rid of any remaining bullets and aliens.
+            # Get rid of any remaining bullets, aliens and projectiles.
             self.bullets.empty()
-            self.aliens.empty()
+            self._aliens.empty()
+            self.alien_fire.reset(self.now)
 
             # Create a new fleet and center the ship.
             self._create_fleet()
@@ -304,18 +684,25 @@ class AlienInvasion:
 
             # Play the sound and pause.
             self.ship_sound_length = self.ship.play_sound()
-            sleep(self.ship_sound_length)
+            self.state.enter(GameState.RESPAWN, self.now, self.ship_sound_length * 1000)
         else:
-            self.game_active = False
+            self._record_score()
+            self.alien_fire.reset(self.now)
+            self.state.enter(GameState.MENU)
             pygame.mouse.set_visible(True)
 
+    def _record_score(self):
+        """Add the score of the game which just ended to the leaderboard."""
+        if not self.player:
+            self.scores.submit(
+                self.settings.difficulty, self.stats.score, self.stats.level
+            )
+
     def _check_aliens_bottom(self):
         """Check if any aliens have reached the bottom of the screen."""
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= self.settings.screen_height:
-                # Treat this the same as if the ship got git.
-                self._ship_hit()
-                break
+        if self.fleet_bounds.at_bottom():
+            # Treat this the same as if the ship got git.
+            self._ship_hit()
 
     def _create_fleet(self):
         """Create the fleet of aliens."""
@@ -334,39 +721,85 @@ class AlienInvasion:
             current_x = alien_width
             current_y += 2 * alien_height
 
+        if self.fleet:
+            self.fleet.build(self._aliens)
+        else:
+            self.fleet_bounds.reset_from_sprites(self._aliens)
+        self.collision_index.build_grid(self._aliens)
+
     def _create_alien(self, x_position, y_position):
         """Create an alien and place it in the fleet."""
         new_alien = Alien(self, self.bullets)
         new_alien.x = x_position
         new_alien.rect.x = x_position
         new_alien.rect.y = y_position
-        self.aliens.add(new_alien)
+        self._aliens.add(new_alien)
 
     def _check_fleet_edges(self):
         """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
+        if self.fleet_bounds.at_edge():
+            self._change_fleet_direction()
 
     def _change_fleet_direction(self):
         """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
+        for alien in self._aliens.sprites():
             alien.rect.y += self.settings.fleet_drop_speed
+        self.fleet_bounds.drop(self.settings.fleet_drop_speed)
         self.settings.fleet_direction *= -1
 
-    def _update_screen(self):
+    def _interpolation_offsets(self, alpha):
+        """
+        Return how far the ship, the fleet, the bullets and the projectiles
+        are drawn from their positions, to show them alpha of the way between
+        the last two time steps.
+        """
+        ship_dx, fleet_dx, bullet_dy, projectile_dy = self.step_motion
+        return (
+            round((alpha - 1) * ship_dx),
+            round((alpha - 1) * fleet_dx),
+            round((alpha - 1) * bullet_dy),
+            round((alpha - 1) * projectile_dy),
+        )
+
+    def _sprite_items(self, offsets):
+        """
+        Return the (image, rect) pairs of every sprite, layer by layer in
+        the order they are drawn, moved by the interpolation offsets.
+        """
+        ship_dx, fleet_dx, bullet_dy, projectile_dy = offsets
+        items = self.bullets.blit_items(bullet_dy)
+        items.append((self.ship.image, self.ship.rect.move(ship_dx, 0)))
+        if self.fleet:
+            items += self.fleet.blit_items(fleet_dx)
+        elif fleet_dx:
+            items += [
+                (alien.image, alien.rect.move(fleet_dx, 0))
+                for alien in self._aliens.sprites()
+            ]
+        else:
+            items += [(alien.image, alien.rect) for alien in self._aliens.sprites()]
+        items += self.alien_fire.blit_items(projectile_dy)
+        if self.startup_finished:
+            items += self.explosions.blit_items()
+            items.append(
+                (self.ship_explosion.image, self.ship_explosion.rect.move(ship_dx, 0))
+            )
+        return items
+
+    def _update_screen(self, alpha=1.0):
         """Update images on the screen, and flip to the new screen."""
-        self.screen.fill(self.settings.bg_color)
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
-        self.ship.blitme()
-        self.aliens.draw(self.screen)
-        self.explosions.draw(self.screen)
-        self.ship_explosion.blitme()
-
-        # Draw the score information.
+        sprite_items = self._sprite_items(self._interpolation_offsets(alpha))
+
+        if self.dirty_rects:
+            self.dirty_rects.erase()
+        else:
+            self.screen.fill(self.settings.bg_color)
+        # Draw every sprite with one call.
+        self.screen.blits(sprite_items, doreturn=False)
+
+        # Draw the score information and the frame profile.
         self.sb.show_score()
+        self.profiler.draw()
 
         # Draw the play button if the game is inactive.
         if not self.game_active:
@@ -375,15 +808,111 @@ class AlienInvasion:
             self.normal_button.draw_button()
             self.hard_button.draw_button()
 
-        pygame.display.flip()
+        if self.dirty_rects:
+            self._track_dirty_rects(sprite_items)
+            self.dirty_rects.update()
+        else:
+            self.scaler.present()
+
+    def _track_dirty_rects(self, sprite_items):
+        """Record everything drawn in this frame for the dirty rects."""
+        add = self.dirty_rects.add
+        for image, rect in sprite_items:
+            add(image, rect)
+
+        add(self.sb.score_image, self.sb.score_rect)
+        add(self.sb.high_score_image, self.sb.high_score_rect)
+        add(self.sb.level_image, self.sb.level_rect)
+        add(self.sb.ships_strip, self.sb.ships_rect)
+        if self.profiler.show_overlay:
+            for image, rect in self.profiler.overlay_items():
+                add(image, rect)
 
-    def _save_high_score(self):
-        """Save the high score in "high_score" file before exit."""
-        path = Path(self.resource_path("assets/high_score"))
-        content = str(self.stats.high_score)
-        path.write_text(content)
+        if not self.game_active:
+            for button in (
+                self.play_button,
+                self.easy_button,
+                self.normal_button,
+                self.hard_button,
+            ):
+                add(button.msg_image, button.rect)
+
+    def _quit_game(self):
+        """Save the scores and the frame profile, and exit the game."""
+        if self.recorder:
+            # Write the frame with the event that quit the game.
+            self.recorder.end_frame(0)
+            self.recorder.close()
+            self._print_session("Recorded", self.recorder.frames)
+        if self.player:
+            self.player.close()
+            self._print_session("Replayed", self.player.frames)
+        if self.game_active:
+            # Quitting ends the game in progress.
+            self._record_score()
+        # Wait for the scores to be written.
+        self.scores.close()
+        if self.settings.pacing_report:
+            print(self.pacer.report())
+        if self.profiler.frames_recorded:
+            self.profiler.export_csv(self.settings.profiler_csv_path)
+        if self.settings.latency_report:
+            latency = self.input.latency_percentiles()
+            print(
+                f"Input to display latency: p50 {latency[50]:.1f}  "
+                f"p95 {latency[95]:.1f}  p99 {latency[99]:.1f} ms"
+            )
+        # Exit the game
+        sys.exit()
+
+    def _print_session(self, verb, frames):
+        """Print the outcome of a recorded or replayed session."""
+        print(
+            f"{verb} {frames} frames (seed {self.seed}): score {self.stats.score}, "
+            f"level {self.stats.level}, ships left {self.stats.ships_left}"
+        )
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Alien Invasion.")
+    parser.add_argument("--record", metavar="PATH", help="record the session")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recorded session")
+    parser.add_argument(
+        "--fast", action="store_true", help="replay as fast as possible"
+    )
+    parser.add_argument("--seed", type=int, help="seed the random generator")
+    parser.add_argument(
+        "--windowed", action="store_true", help="play in a window, not fullscreen"
+    )
+    parser.add_argument(
+        "--busy-loop",
+        action="store_true",
+        help="wait for the frames of a game with a busy loop",
+    )
+    parser.add_argument(
+        "--pacing-report",
+        action="store_true",
+        help="print the CPU time used per second in the menu and in games",
+    )
+    parser.add_argument(
+        "--latency-report",
+        action="store_true",
+        help="print the input to display latency percentiles",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print how long each phase of the startup took",
+    )
+    args = parser.parse_args()
+
     # Make a game instance, and run the game.
-    ai = AlienInvasion()
+    ai = AlienInvasion(seed=args.seed, windowed=args.windowed)
+    ai.settings.startup_report = args.startup_report
+    ai.settings.busy_loop_pacing = args.busy_loop
+    ai.settings.pacing_report = args.pacing_report
+    ai.settings.latency_report = args.latency_report
+    if args.record:
+        ai.start_recording(args.record)
+    if args.replay:
+        ai.start_replay(args.replay, args.fast)
     ai.run_game()
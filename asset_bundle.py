@@ -0,0 +1,198 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+from pygame import mixer
+
+
+# Every bundle starts with the magic bytes and the size of its JSON index.
+MAGIC = b"AIBUNDLE"
+HEADER = struct.Struct("<8sQ")
+VERSION = 2
+
+# The sounds are stored decoded for this mixer format, which the game
+#   initializes the mixer with.
+MIXER_FORMAT = (44100, -16, 2)
+
+IMAGE_EXTENSIONS = (".bmp", ".png", ".jpg", ".jpeg")
+SOUND_EXTENSIONS = (".wav", ".mp3", ".ogg")
+
+# Start every asset on a new page, so reading one never touches another.
+ALIGNMENT = 4096
+
+
+def _align(offset):
+    """Return the first page boundary at or after offset."""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class AssetBundle:
+    """
+    A class to read images and sounds out of a memory-mapped bundle, in
+    which they are already decoded.
+    """
+
+    def __init__(self, path):
+        """Map the bundle into memory and read its index."""
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = memoryview(self._map)
+
+        magic, index_size = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an asset bundle")
+        index = json.loads(bytes(self._data[HEADER.size : HEADER.size + index_size]))
+        if index["version"] != VERSION:
+            raise ValueError(f"Unsupported asset bundle version {index['version']}")
+        self.mixer_format = tuple(index["mixer_format"])
+        self.entries = index["entries"]
+        # The offsets of the entries start at the page after the index.
+        self.data_start = _align(HEADER.size + index_size)
+
+    def __contains__(self, relative_path):
+        return self._key(relative_path) in self.entries
+
+    def matches(self, relative_path, source_stat):
+        """
+        Return True if the bundle holds the file as it is now: built from a
+        source of the same size and modification time. A source_stat of
+        None means there is no source to compare with, as in a frozen game.
+        """
+        entry = self.entries.get(self._key(relative_path))
+        if entry is None:
+            return False
+        if source_stat is None:
+            return True
+        return (
+            entry["source_size"] == source_stat.st_size
+            and entry["source_mtime_ns"] == source_stat.st_mtime_ns
+        )
+
+    def _key(self, relative_path):
+        """Return the index key of a path, which always uses slashes."""
+        return relative_path.replace(os.sep, "/")
+
+    def _slice(self, entry):
+        """Return the bytes of an entry, without copying them."""
+        start = self.data_start + entry["offset"]
+        return self._data[start : start + entry["length"]]
+
+    def image(self, relative_path):
+        """Return a surface which uses the pixels in the bundle."""
+        entry = self.entries[self._key(relative_path)]
+        return pygame.image.frombuffer(
+            self._slice(entry), entry["size"], entry["format"]
+        )
+
+    def sound(self, relative_path):
+        """
+        Return the sound made from the samples in the bundle, or None if
+        the mixer doesn't play the format they were stored in.
+        """
+        if mixer.get_init() != self.mixer_format:
+            return None
+        entry = self.entries[self._key(relative_path)]
+        return mixer.Sound(buffer=self._slice(entry))
+
+    def sound_bytes(self, relative_path):
+        """
+        Return the size of a decoded sound in the bundle, or None if the
+        mixer doesn't play the format it was stored in.
+        """
+        if mixer.get_init() != self.mixer_format:
+            return None
+        return self.entries[self._key(relative_path)]["length"]
+
+    def listdir(self, relative_path):
+        """Return the sorted names of the files of a directory in the bundle."""
+        prefix = self._key(relative_path).rstrip("/") + "/"
+        return sorted(
+            key[len(prefix) :]
+            for key in self.entries
+            if key.startswith(prefix) and "/" not in key[len(prefix) :]
+        )
+
+
+def build(source_dir="assets", path="assets.bundle"):
+    """
+    Decode every image and sound under source_dir and write them to one
+    bundle file at path. Return the number of assets.
+    """
+    if mixer.get_init() != MIXER_FORMAT:
+        mixer.quit()
+        mixer.init(*MIXER_FORMAT, allowedchanges=0)
+
+    entries = {}
+    blobs = []
+    offset = 0
+    root = os.path.dirname(os.path.abspath(source_dir))
+    for directory, dir_names, file_names in os.walk(source_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            file_path = os.path.join(directory, file_name)
+            key = os.path.relpath(os.path.abspath(file_path), root).replace(os.sep, "/")
+            extension = os.path.splitext(file_name)[1].lower()
+            if extension in IMAGE_EXTENSIONS:
+                image = pygame.image.load(file_path)
+                image_format = "RGBA" if image.get_flags() & pygame.SRCALPHA else "RGB"
+                data = pygame.image.tobytes(image, image_format)
+                entry = {
+                    "kind": "image",
+                    "size": list(image.get_size()),
+                    "format": image_format,
+                }
+            elif extension in SOUND_EXTENSIONS:
+                data = mixer.Sound(file_path).get_raw()
+                entry = {"kind": "sound"}
+            else:
+                continue
+
+            # Record the source, so a changed file isn't read from the bundle.
+            stat = os.stat(file_path)
+            entry["source_size"] = stat.st_size
+            entry["source_mtime_ns"] = stat.st_mtime_ns
+            offset = _align(offset)
+            entry["offset"] = offset
+            entry["length"] = len(data)
+            entries[key] = entry
+            blobs.append((offset, data))
+            offset += len(data)
+
+    index = {"version": VERSION, "mixer_format": list(MIXER_FORMAT), "entries": entries}
+    index_bytes = json.dumps(index).encode()
+    data_start = _align(HEADER.size + len(index_bytes))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(index_bytes)))
+        file.write(index_bytes)
+        for blob_offset, data in blobs:
+            file.seek(data_start + blob_offset)
+            file.write(data)
+    os.replace(temp_path, path)
+    return len(entries)
+
+
+def main(argv=None):
+    """Build the asset bundle from the command line."""
+    parser = argparse.ArgumentParser(description="Pack the assets into one file.")
+    parser.add_argument("--source", default="assets")
+    parser.add_argument("--output", default="assets.bundle")
+    args = parser.parse_args(argv)
+
+    # Decoding needs no window and no sound card.
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    count = build(args.source, args.output)
+    size = os.path.getsize(args.output)
+    print(f"Packed {count} assets into {args.output} ({size / 2**20:.1f} MiB).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
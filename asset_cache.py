@@ -0,0 +1,194 @@
+import os
+import sys
+
+import pygame
+from pygame import mixer
+
+from asset_bundle import AssetBundle
+
+
+class SilentSound:
+    """A stand-in for a sound when the mixer is not initialized."""
+
+    def __init__(self, length=1.0):
+        """Pauses which wait for this sound last length seconds."""
+        self.length = length
+
+    def play(self, *args, **kwargs):
+        """Play nothing."""
+        return None
+
+    def get_length(self):
+        return self.length
+
+
+class AssetCache:
+    """A class to load every image and sound only once per process."""
+
+    # The cached objects are shared by every game in the process.
+    _images = {}
+    _sounds = {}
+    _frames = {}
+
+    # The asset bundle, opened once per process (False if there is none).
+    _bundle = None
+
+    def __init__(self):
+        """Initialize the base path, the bundle and the hit/miss counters."""
+        # PyInstaller creates a temp folder and stores its path in _MEIPASS.
+        self.base_path = getattr(sys, "_MEIPASS", os.path.abspath("."))
+
+        # Read the decoded assets from the bundle if it has been built.
+        if AssetCache._bundle is None:
+            AssetCache._bundle = self._open_bundle()
+        self.bundle = AssetCache._bundle
+
+        self.hits = 0
+        self.misses = 0
+
+    def resource_path(self, relative_path):
+        """Return the full path of an asset."""
+        return os.path.join(self.base_path, relative_path)
+
+    def bundle_path(self):
+        """
+        Return the path of the asset bundle. A PyInstaller build keeps it
+        beside the executable, since a one-file executable would unpack it
+        to _MEIPASS again on every start.
+        """
+        if getattr(sys, "frozen", False):
+            return os.path.join(os.path.dirname(sys.executable), "assets.bundle")
+        return self.resource_path("assets.bundle")
+
+    def _open_bundle(self):
+        """
+        Return the asset bundle, or False if there is none or it was built
+        by another version of the game. A frozen game ships no loose
+        assets, so it can't run without the bundle.
+        """
+        path = self.bundle_path()
+        try:
+            return AssetBundle(path)
+        except (FileNotFoundError, ValueError) as error:
+            if getattr(sys, "frozen", False):
+                raise FileNotFoundError(
+                    f"Can't read the asset bundle {path} ({error}); keep the "
+                    "assets.bundle the game was built with beside the executable."
+                ) from error
+            return False
+
+    def _bundled(self, relative_path):
+        """Return True if the bundle holds the file as it is now."""
+        if not self.bundle:
+            return False
+        try:
+            source_stat = os.stat(self.resource_path(relative_path))
+        except FileNotFoundError:
+            source_stat = None
+        return self.bundle.matches(relative_path, source_stat)
+
+    def image(self, relative_path, alpha=False):
+        """
+        Return the image of the file, loaded and converted to the display
+        pixel format the first time it is asked for.
+        """
+        key = (relative_path, alpha)
+        image = self._images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        image = self.load_image(relative_path)
+        # Converting only works once a display mode has been set.
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha() if alpha else image.convert()
+        self._images[key] = image
+        return image
+
+    def frames(self, relative_path, columns, rows, size=None):
+        """
+        Return the animation frames of a sprite sheet, sliced (and scaled to
+        size, if it is given) the first time they are asked for.
+        """
+        key = (relative_path, columns, rows, size)
+        frames = self._frames.get(key)
+        if frames is not None:
+            self.hits += 1
+            return frames
+
+        sheet = self.image(relative_path, alpha=True)
+        width = sheet.get_width() // columns
+        height = sheet.get_height() // rows
+
+        frames = []
+        for row in range(rows):
+            for col in range(columns):
+                frame = sheet.subsurface(
+                    pygame.Rect(col * width, row * height, width, height)
+                )
+                if size is not None:
+                    frame = pygame.transform.scale(frame, size)
+                frames.append(frame)
+        self._frames[key] = frames
+        return frames
+
+    def sound(self, relative_path):
+        """Return the sound of the file, decoded the first time it is asked for."""
+        if mixer.get_init() is None:
+            return SilentSound()
+
+        sound = self._sounds.get(relative_path)
+        if sound is not None:
+            self.hits += 1
+            return sound
+
+        self.misses += 1
+        sound = self.load_sound(relative_path)
+        self._sounds[relative_path] = sound
+        return sound
+
+    def load_image(self, relative_path):
+        """Return a new image of the file, from the bundle if it is there."""
+        if self._bundled(relative_path):
+            return self.bundle.image(relative_path)
+        return pygame.image.load(self.resource_path(relative_path))
+
+    def load_sound(self, relative_path):
+        """Return a new sound of the file, from the bundle if it is there."""
+        sound = None
+        if self._bundled(relative_path):
+            sound = self.bundle.sound(relative_path)
+        if sound is None:
+            sound = mixer.Sound(self.resource_path(relative_path))
+        return sound
+
+    def sound_bytes(self, relative_path):
+        """
+        Return the size of the file's decoded sound, read from the bundle
+        without decoding it, or None if the bundle can't tell.
+        """
+        if self._bundled(relative_path):
+            return self.bundle.sound_bytes(relative_path)
+        return None
+
+    def listdir(self, relative_path):
+        """
+        Return the sorted names of the files in an asset directory, from
+        the bundle if the directory isn't there.
+        """
+        path = self.resource_path(relative_path)
+        if self.bundle and not os.path.isdir(path):
+            return self.bundle.listdir(relative_path)
+        return sorted(os.listdir(path))
+
+    def stats(self):
+        """Return the hit/miss counters and the number of cached assets."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "images": len(self._images),
+            "frames": len(self._frames),
+            "sounds": len(self._sounds),
+            "bundle": bool(self.bundle),
+        }
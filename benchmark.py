@@ -0,0 +1,366 @@
+import argparse
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from alien import Alien
+from frame_profiler import FrameProfiler
+
+
+# The phases of a frame which are timed, in the order they run; the
+#   benchmark has no events to read and doesn't wait for the frame rate.
+PHASES = tuple(
+    phase for phase in FrameProfiler.PHASES if phase not in ("events", "tick")
+)
+
+
+class Benchmark:
+    """A class to time the phases of a frame in deterministic scenarios."""
+
+    def __init__(self, frames=600, warmup=60):
+        """Initialize the benchmark."""
+        self.frames = frames
+        self.warmup = warmup
+        self.results = {}
+
+        # Every scenario returns a game ready to run and a function which
+        #   is called before every frame.
+        self.scenarios = {
+            "fleet_1080p": lambda: self._fleet((1920, 1080)),
+            "fleet_4k": lambda: self._fleet((3840, 2160)),
+            "scaled_1080p": lambda: self._scaled((1920, 1080)),
+            "scaled_4k": lambda: self._scaled((3840, 2160)),
+            "max_bullets": self._max_bullets,
+            "explosions_50": self._explosions,
+            "level_10": self._level_10,
+            "alien_fire_5000": self._alien_fire,
+        }
+
+    def _new_game(self, size=(1920, 1080), display_size=None):
+        """
+        Make a headless game and start playing, with its profiler on; a
+        display_size plays at the logical resolution scaled to that size.
+        """
+        # A fixed seed makes the aliens fire the same volleys every run.
+        if display_size is None:
+            ai = AlienInvasion(headless=True, size=size, seed=0)
+        else:
+            ai = AlienInvasion(headless=True, display_size=display_size, seed=0)
+        ai.settings.ship_limit = 1000
+        ai._start_game()
+        # Time the phases without drawing the overlay.
+        ai.profiler.enabled = True
+        return ai
+
+    def _sweep_ship(self, ai, frame):
+        """Move the ship back and forth across the screen."""
+        ai.ship.moving_right = (frame // 120) % 2 == 0
+        ai.ship.moving_left = not ai.ship.moving_right
+
+    def _fleet(self, size):
+        """A full fleet with the default number of bullets."""
+        ai = self._new_game(size)
+
+        def before_frame(frame):
+            self._sweep_ship(ai, frame)
+            if frame % 10 == 0:
+                ai._fire_bullet()
+
+        return ai, before_frame
+
+    def _scaled(self, display_size):
+        """A full fleet at the logical resolution, scaled to the display."""
+        ai = self._new_game(display_size=display_size)
+
+        def before_frame(frame):
+            self._sweep_ship(ai, frame)
+            if frame % 10 == 0:
+                ai._fire_bullet()
+
+        return ai, before_frame
+
+    def _max_bullets(self):
+        """A full fleet with a bullet fired every frame."""
+        ai = self._new_game()
+        ai.settings.bullets_allowed = 500
+
+        def before_frame(frame):
+            self._sweep_ship(ai, frame)
+            ai._fire_bullet()
+
+        return ai, before_frame
+
+    def _explosions(self):
+        """A full fleet with 50 explosions playing at all times."""
+        ai = self._new_game()
+        screen_rect = ai.screen.get_rect()
+
+        def before_frame(frame):
+            self._sweep_ship(ai, frame)
+            index = 0
+            while len(ai.explosions) < 50:
+                index += 1
+                center = (
+                    (frame * 37 + index * 101) % screen_rect.width,
+                    (frame * 53 + index * 67) % screen_rect.height,
+                )
+                ai.explosions.spawn(center, ai.now)
+
+        return ai, before_frame
+
+    def _level_10(self):
+        """A full fleet at the speeds of level 10."""
+        ai = self._new_game()
+        for level in range(9):
+            ai.settings.increase_speed()
+
+        def before_frame(frame):
+            self._sweep_ship(ai, frame)
+            if frame % 10 == 0:
+                ai._fire_bullet()
+
+        return ai, before_frame
+
+    def _alien_fire(self, count=5000):
+        """
+        A full fleet with count alien projectiles on the screen at all
+        times, which all miss the ship in the middle.
+        """
+        ai = self._new_game()
+        # Only the projectiles added here are on the screen.
+        ai.settings.alien_fire_interval = float("inf")
+        ai.alien_fire.reset(ai.now)
+        screen_rect = ai.screen.get_rect()
+        ship_rect = ai.ship.rect
+        rng = random.Random(0)
+        lanes = [
+            x
+            for x in range(0, screen_rect.width, ai.settings.alien_projectile_width)
+            if not ship_rect.left - 10 <= x <= ship_rect.right + 10
+        ]
+
+        def before_frame(frame):
+            # Spread the first projectiles over the screen, then add new
+            #   ones at the top as the others leave it.
+            height = screen_rect.height if frame == 0 else 1
+            while len(ai.alien_fire) < count:
+                ai.alien_fire.spawn(rng.choice(lanes), rng.randrange(height))
+
+        return ai, before_frame
+
+    def _run_frames(self, ai, before_frame, frames, timings=None):
+        """
+        Run frames of the game's own _step() and _update_screen(), adding
+        the time of each phase from the frame profiler to timings.
+        """
+        profiler = ai.profiler
+        for frame in range(frames):
+            before_frame(frame)
+            profiler.begin_frame()
+            ai._step()
+            ai._update_screen()
+            profiler.lap("screen")
+
+            if timings is not None:
+                for phase in PHASES:
+                    timings[phase] += profiler.timings[phase][profiler.frame]
+
+    def _time_create_fleet(self, ai, repeats=20):
+        """Return the mean time of _create_fleet() in ms."""
+        start = perf_counter()
+        for repeat in range(repeats):
+            ai.aliens.empty()
+            ai._create_fleet()
+        return 1000 * (perf_counter() - start) / repeats
+
+    def run_scenario(self, name):
+        """Run one scenario and return its timings in ms per frame."""
+        ai, before_frame = self.scenarios[name]()
+        self._run_frames(ai, before_frame, self.warmup)
+
+        timings = dict.fromkeys(PHASES, 0.0)
+        start = perf_counter()
+        self._run_frames(ai, before_frame, self.frames, timings)
+        total = perf_counter() - start
+
+        # Measure allocations in a separate, shorter pass, since tracing
+        #   them slows everything down.
+        tracemalloc.start()
+        self._run_frames(ai, before_frame, min(self.frames, 60))
+        alloc_current, alloc_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        result = {phase: 1000 * timings[phase] / self.frames for phase in PHASES}
+        result["frame"] = 1000 * total / self.frames
+        result["fps"] = self.frames / total
+        result["create_fleet"] = self._time_create_fleet(ai)
+        result["alloc_peak_kib"] = alloc_peak / 1024
+        result["alien_count"] = ai.alien_count
+        return result
+
+    def run_draw(self, count=1000, repeats=100):
+        """
+        Time drawing count bullets, aliens and explosions one by one, as
+        the game used to, and with one blits() call; return ms per 1,000.
+        """
+        ai = self._new_game()
+        screen = ai.screen
+        screen_rect = screen.get_rect()
+        rng = random.Random(0)
+
+        def random_rect(size):
+            return pygame.Rect(
+                (
+                    rng.randrange(screen_rect.width - size[0]),
+                    rng.randrange(screen_rect.height - size[1]),
+                ),
+                size,
+            )
+
+        bullet_size = (ai.settings.bullet_width, ai.settings.bullet_height)
+        bullet_rects = [random_rect(bullet_size) for index in range(count)]
+        aliens = pygame.sprite.Group()
+        for index in range(count):
+            alien = Alien(ai, ai.bullets)
+            alien.rect = random_rect(alien.rect.size)
+            aliens.add(alien)
+        frames = ai.explosions.frames
+        explosions = [
+            (frames[index % len(frames)], random_rect(frames[0].get_size()))
+            for index in range(count)
+        ]
+
+        def draw_bullets():
+            for rect in bullet_rects:
+                pygame.draw.rect(screen, ai.settings.bullet_color, rect)
+
+        def blit_bullets():
+            image = ai.bullets.image
+            screen.blits([(image, rect) for rect in bullet_rects], doreturn=False)
+
+        def draw_explosions():
+            for image, rect in explosions:
+                screen.blit(image, rect)
+
+        cases = {
+            "bullets": (draw_bullets, blit_bullets),
+            "aliens": (
+                lambda: aliens.draw(screen),
+                lambda: screen.blits(
+                    [(alien.image, alien.rect) for alien in aliens.sprites()],
+                    doreturn=False,
+                ),
+            ),
+            "explosions": (
+                draw_explosions,
+                lambda: screen.blits(list(explosions), doreturn=False),
+            ),
+        }
+
+        results = {}
+        for name, (before, after) in cases.items():
+            results[name] = {}
+            for label, draw in (("before", before), ("after", after)):
+                draw()
+                start = perf_counter()
+                for repeat in range(repeats):
+                    draw()
+                seconds = (perf_counter() - start) / repeats
+                results[name][label] = 1000 * seconds * 1000 / count
+        return results
+
+    def report_draw(self, results):
+        """Print the draw times per 1,000 sprites."""
+        print(f"{'sprites':<16}{'before':>15}{'after':>15}{'speedup':>15}")
+        for name, result in results.items():
+            print(
+                f"{name:<16}{result['before']:>15.3f}{result['after']:>15.3f}"
+                f"{result['before'] / result['after']:>15.2f}"
+            )
+
+    def run(self, names=None):
+        """Run the scenarios, all of them by default."""
+        for name in names or self.scenarios:
+            self.results[name] = self.run_scenario(name)
+        return self.results
+
+    def report(self):
+        """Print the results as a table."""
+        columns = PHASES + ("create_fleet", "frame", "fps", "alloc_peak_kib")
+        print(f"{'scenario':<16}" + "".join(f"{column:>15}" for column in columns))
+        for name, result in self.results.items():
+            print(
+                f"{name:<16}"
+                + "".join(f"{result[column]:>15.3f}" for column in columns)
+            )
+
+    def compare(self, baseline, threshold, floor=0.05):
+        """
+        Return a list of the timings which are more than threshold slower
+        than the baseline; timings under floor ms are too noisy to compare.
+        """
+        regressions = []
+        for name, result in self.results.items():
+            for key in PHASES + ("create_fleet", "frame"):
+                old = baseline.get(name, {}).get(key)
+                if old is None or max(old, result[key]) < floor:
+                    continue
+                if result[key] > old * (1 + threshold):
+                    regressions.append(
+                        f"{name}.{key}: {old:.3f} ms -> {result[key]:.3f} ms"
+                    )
+        return regressions
+
+
+def main(argv=None):
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark Alien Invasion.")
+    parser.add_argument("scenarios", nargs="*", help="scenarios to run (default: all)")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--baseline", default="benchmark_baseline.json")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store the results as baseline"
+    )
+    parser.add_argument(
+        "--draw",
+        action="store_true",
+        help="time drawing 1,000 sprites one by one and batched",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="fail if a timing is this fraction slower than the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    benchmark = Benchmark(frames=args.frames)
+    if args.draw:
+        benchmark.report_draw(benchmark.run_draw())
+        return 0
+
+    benchmark.run(args.scenarios)
+    benchmark.report()
+
+    path = Path(args.baseline)
+    if args.save_baseline:
+        path.write_text(json.dumps(benchmark.results, indent=2))
+        print(f"Saved the baseline to {path}.")
+        return 0
+    if not path.exists():
+        return 0
+
+    regressions = benchmark.compare(json.loads(path.read_text()), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,42 +1,122 @@
 import pygame
-from pygame.sprite import Sprite
-from pygame import mixer
 
 
-class Bullet(Sprite):
+class Bullet:
     """A class to manage bullets fired from the ship."""
 
+    __slots__ = ("rect", "y")
+
+    def __init__(self, settings):
+        """Create a bullet rect at (0, 0)."""
+        self.rect = pygame.Rect(0, 0, settings.bullet_width, settings.bullet_height)
+
+        # Store the bullet's position as a float.
+        self.y = 0.0
+
+    def fire_from(self, ship_rect):
+        """Place the bullet at the ship's current position."""
+        self.rect.midtop = ship_rect.midtop
+        self.y = float(self.rect.y)
+
+
+class BulletPool:
+    """A class to recycle a fixed number of bullets instead of making new ones."""
+
     def __init__(self, ai_game):
-        """Create a bullet object at the ship's current position."""
-        super().__init__()
+        """Create every bullet the game is allowed to have at once."""
         self.screen = ai_game.screen
         self.settings = ai_game.settings
         self.color = self.settings.bullet_color
 
-        # Create a bullet rect at (0, 0) and then set correct position.
-        self.rect = pygame.Rect(
-            0, 0, self.settings.bullet_width, self.settings.bullet_height
+        # Every bullet is drawn with the same image, which is filled once.
+        self.image = pygame.Surface(
+            (self.settings.bullet_width, self.settings.bullet_height), 0, self.screen
         )
-        self.rect.midtop = ai_game.ship.rect.midtop
+        self.image.fill(self.color)
 
-        # Store the bullet's position as a float.
-        self.y = float(self.rect.y)
+        # Bullets in use are kept at the front of the list.
+        self._bullets = [
+            Bullet(self.settings) for _ in range(self.settings.bullets_allowed)
+        ]
+        self.active = 0
 
-        # Instantiate mixer
-        mixer.init()
+        # Track how much of the pool is used.
+        self.peak = 0
+        self.fired = 0
 
-        # Load audio file and set the volume
-        self.bullet_sound = mixer.Sound(
-            ai_game.resource_path("assets/sounds/alienshoot1.wav")
-        )
+        # Load audio file.
+        self.bullet_sound = ai_game.assets.sound("assets/sounds/alienshoot1.wav")
+
+    def __len__(self):
+        return self.active
+
+    def __iter__(self):
+        bullets = self._bullets
+        for index in range(self.active):
+            yield bullets[index]
+
+    def sprites(self):
+        """Return a list of the bullets in use."""
+        return self._bullets[: self.active]
+
+    @property
+    def capacity(self):
+        return len(self._bullets)
+
+    def fire(self, ship_rect):
+        """Take a free bullet from the pool and return True if there was one."""
+        if self.active == self.capacity:
+            if self.capacity >= self.settings.bullets_allowed:
+                return False
+            # bullets_allowed was raised after the pool was made.
+            self._bullets.append(Bullet(self.settings))
+
+        self._bullets[self.active].fire_from(ship_rect)
+        self.active += 1
+        self.fired += 1
+        self.peak = max(self.peak, self.active)
+        return True
 
     def update(self):
-        """Move the bullet up the screen."""
-        # Update the exact position of the bullet.
-        self.y -= self.settings.bullet_speed
-        # Update the rect position.
-        self.rect.y = self.y
-
-    def draw_bullet(self):
-        """Draw the bullet to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
+        """Move the bullets up the screen and free the ones that disappeared."""
+        bullets = self._bullets
+        speed = self.settings.bullet_speed * self.settings.time_step
+        index = 0
+        while index < self.active:
+            bullet = bullets[index]
+            # Update the exact position of the bullet, then the rect.
+            bullet.y -= speed
+            bullet.rect.y = bullet.y
+
+            if bullet.rect.bottom <= 0:
+                # Swap the last bullet in use into this slot; it still
+                #   has to be moved this frame.
+                self.active -= 1
+                bullets[index] = bullets[self.active]
+                bullets[self.active] = bullet
+            else:
+                index += 1
+
+    def empty(self):
+        """Free every bullet."""
+        self.active = 0
+
+    def blit_items(self, dy=0):
+        """Return the (image, rect) pairs of the bullets, dy pixels below them."""
+        image = self.image
+        bullets = self._bullets
+        if dy:
+            return [
+                (image, bullets[index].rect.move(0, dy)) for index in range(self.active)
+            ]
+        return [(image, bullets[index].rect) for index in range(self.active)]
+
+    def stats(self):
+        """Return the pool utilization."""
+        return {
+            "capacity": self.capacity,
+            "active": self.active,
+            "peak": self.peak,
+            "fired": self.fired,
+            "utilization": self.active / self.capacity if self.capacity else 0.0,
+        }
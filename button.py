@@ -1,4 +1,6 @@
-import pygame.font
+import pygame
+
+from glyph_atlas import GlyphAtlas
 
 
 class Button:
@@ -13,7 +15,7 @@ class Button:
         self.width, self.height = 200, 50
         self.button_color = color
         self.text_color = text_color
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.fonts.get(None, 48)
 
         # Build the button's rect object and center it.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
@@ -24,7 +26,9 @@ class Button:
 
     def _prep_msg(self, msg):
         """Turn msg into a rendered image and center text on the button."""
-        self.msg_image = self.font.render(msg, True, self.text_color, self.button_color)
+        # Every label is rendered only once per font and colors.
+        atlas = GlyphAtlas.get(self.font, self.text_color, self.button_color)
+        self.msg_image = atlas.label(msg)
         self.msg_image_rect = self.msg_image.get_rect()
         self.msg_image_rect.center = self.rect.center
 
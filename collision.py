@@ -0,0 +1,146 @@
+class CollisionIndex:
+    """A class to find bullet-alien collisions without testing every pair."""
+
+    def __init__(self, ai_game):
+        """Initialize an empty index."""
+        self.settings = ai_game.settings
+        # The array-based fleet only moves the rects which are looked at.
+        self.fleet = ai_game.fleet
+        self.cells = {}
+        self.ref_alien = None
+
+    def build_grid(self, aliens):
+        """
+        Index a fleet laid out on a regular grid; aliens are spaced one alien
+        width and one alien height apart, so the pitch is twice their size.
+        A fleet which isn't laid out that way falls back to the spatial hash.
+        """
+        self.clear()
+        sprites = aliens.sprites()
+        if not sprites:
+            return
+
+        width, height = sprites[0].rect.size
+        self.pitch_x, self.pitch_y = 2 * width, 2 * height
+        x0 = min(alien.rect.x for alien in sprites)
+        y0 = min(alien.rect.y for alien in sprites)
+
+        for alien in sprites:
+            col, col_offset = divmod(alien.rect.x - x0, self.pitch_x)
+            row, row_offset = divmod(alien.rect.y - y0, self.pitch_y)
+            if (
+                alien.rect.size != (width, height)
+                or col_offset
+                or row_offset
+                or (row, col) in self.cells
+            ):
+                # The alien is off the grid, or shares a cell with another.
+                self.clear()
+                return
+            alien.grid_pos = (row, col)
+            self.cells[(row, col)] = alien
+        self.cols = max(col for row, col in self.cells) + 1
+        self.rows = max(row for row, col in self.cells) + 1
+        self.ref_alien = sprites[0]
+
+    def clear(self):
+        """Forget the grid; collisions fall back to the spatial hash."""
+        self.cells = {}
+        self.ref_alien = None
+
+    def collide(self, bullets, aliens):
+        """
+        Return a dict mapping every bullet that hit aliens to the list of
+        aliens it hit, and kill those aliens, like groupcollide(bullets,
+        aliens, False, True) does.
+        """
+        if self.ref_alien is not None:
+            return self._collide_grid(bullets)
+        return self._collide_hash(bullets, aliens)
+
+    def _grid_origin(self):
+        """Return the current position of the grid's top left cell."""
+        if not self.ref_alien.alive():
+            self.ref_alien = next(iter(self.cells.values()), None)
+            if self.ref_alien is None:
+                return None
+        if self.fleet:
+            self.fleet.sync_rect(self.ref_alien)
+        row, col = self.ref_alien.grid_pos
+        rect = self.ref_alien.rect
+        return rect.x - col * self.pitch_x, rect.y - row * self.pitch_y
+
+    def _collide_grid(self, bullets):
+        """Look up the grid cells under each bullet."""
+        collisions = {}
+        origin = self._grid_origin()
+        if origin is None:
+            return collisions
+        origin_x, origin_y = origin
+        pitch_x, pitch_y = self.pitch_x, self.pitch_y
+        cells = self.cells
+        fleet = self.fleet
+
+        for bullet in bullets:
+            rect = bullet.rect
+            # Widen the search by a pixel since aliens round their float
+            #   positions separately.
+            col_lo = max((rect.left - origin_x - 1) // pitch_x, 0)
+            col_hi = min((rect.right - origin_x) // pitch_x, self.cols - 1)
+            row_lo = max((rect.top - origin_y - 1) // pitch_y, 0)
+            row_hi = min((rect.bottom - origin_y) // pitch_y, self.rows - 1)
+            if col_lo > col_hi or row_lo > row_hi:
+                continue
+
+            hit = []
+            for row in range(row_lo, row_hi + 1):
+                for col in range(col_lo, col_hi + 1):
+                    alien = cells.get((row, col))
+                    if alien is None:
+                        continue
+                    if fleet:
+                        fleet.sync_rect(alien)
+                    if rect.colliderect(alien.rect):
+                        hit.append(alien)
+            if hit:
+                for alien in hit:
+                    del cells[alien.grid_pos]
+                    alien.kill()
+                collisions[bullet] = hit
+        return collisions
+
+    def _collide_hash(self, bullets, aliens):
+        """Bucket free-moving aliens in a uniform spatial hash."""
+        collisions = {}
+        sprites = aliens.sprites()
+        if not sprites:
+            return collisions
+        if self.fleet:
+            self.fleet.sync_rects()
+
+        cell_w = max(alien.rect.width for alien in sprites)
+        cell_h = max(alien.rect.height for alien in sprites)
+        buckets = {}
+        for alien in sprites:
+            rect = alien.rect
+            for cx in range(rect.left // cell_w, (rect.right - 1) // cell_w + 1):
+                for cy in range(rect.top // cell_h, (rect.bottom - 1) // cell_h + 1):
+                    buckets.setdefault((cx, cy), []).append(alien)
+
+        for bullet in bullets:
+            rect = bullet.rect
+            hit = []
+            for cx in range(rect.left // cell_w, (rect.right - 1) // cell_w + 1):
+                for cy in range(rect.top // cell_h, (rect.bottom - 1) // cell_h + 1):
+                    for alien in buckets.get((cx, cy), ()):
+                        if (
+                            alien not in hit
+                            and alien.alive()
+                            and rect.colliderect(alien.rect)
+                        ):
+                            hit.append(alien)
+            if hit:
+                for alien in hit:
+                    alien.kill()
+                collisions[bullet] = hit
+        return collisions
@@ -0,0 +1,78 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from alien_invasion import AlienInvasion
+from fleet import Fleet
+
+
+def alien_rects(ai):
+    """
+    Return (alien, rect) pairs of where the aliens are. The rects of the
+    array fleet are worked out from its arrays, so the aliens' own rects
+    are left as stale as the game left them.
+    """
+    sprites = ai._aliens.sprites()
+    if not ai.fleet or not sprites:
+        return [(alien, alien.rect) for alien in sprites]
+    fleet = ai.fleet
+    lefts, tops = fleet._positions([alien.fleet_index for alien in sprites])
+    return [
+        (alien, pygame.Rect(left, top, fleet.alien_width, fleet.alien_height))
+        for alien, left, top in zip(sprites, lefts, tops)
+    ]
+
+
+def aim(ai):
+    """Return the actions which move the ship under the nearest alien and fire."""
+    ship_x = ai.ship.rect.centerx
+    target = min(
+        (rect.centerx for alien, rect in alien_rects(ai)),
+        key=lambda x: abs(x - ship_x),
+        default=ship_x,
+    )
+    if target > ship_x + 2:
+        return ("right", "fire")
+    if target < ship_x - 2:
+        return ("left", "fire")
+    return ("fire",)
+
+
+@pytest.fixture
+def play(monkeypatch):
+    """
+    Return a function which starts a headless 600x400 game with the
+    "arrays" or the "sprites" fleet. The aliens don't fire, so the fleet
+    decides when ships are lost, and there are ships enough for a long game.
+    """
+
+    def play(fleet, seed):
+        if fleet == "arrays" and not Fleet.available():
+            pytest.skip("NumPy is not installed")
+        if fleet == "sprites":
+            monkeypatch.setattr(Fleet, "available", staticmethod(lambda: False))
+
+        ai = AlienInvasion(headless=True, size=(600, 400), render=False, seed=seed)
+        assert (ai.fleet is not None) == (fleet == "arrays")
+        ai.settings.ship_limit = 50
+        ai.step(("play",))
+        ai.settings.alien_fire_interval = float("inf")
+        return ai
+
+    return play
+
+
+@pytest.fixture(name="alien_rects")
+def alien_rects_fixture():
+    """Return alien_rects()."""
+    return alien_rects
+
+
+@pytest.fixture(name="aim")
+def aim_fixture():
+    """Return aim()."""
+    return aim
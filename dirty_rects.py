@@ -0,0 +1,77 @@
+class DirtyRects:
+    """A class to push only the parts of the screen that changed to the display."""
+
+    def __init__(self, ai_game):
+        """Initialize the tracker; the first frame is always pushed in full."""
+        self.screen = ai_game.screen
+        self.scaler = ai_game.scaler
+        self.settings = ai_game.settings
+        screen_rect = self.screen.get_rect()
+        self.screen_area = screen_rect.width * screen_rect.height
+
+        # Everything drawn in the last frame and in this frame, as
+        #   (key, rect) pairs; the key is the image or what the item is.
+        self._last = []
+        self._current = []
+        self.full_redraw = True
+
+        # Count the pixels pushed to the display.
+        self.pixels_pushed = 0
+        self.total_pixels_pushed = 0
+        self.frames = 0
+        self.full_frames = 0
+
+    def erase(self):
+        """Fill the places of last frame's items with the background color."""
+        bg_color = self.settings.bg_color
+        if self.full_redraw:
+            self.screen.fill(bg_color)
+        else:
+            for key, rect in self._last:
+                self.screen.fill(bg_color, rect)
+        self._current = []
+
+    def add(self, key, rect):
+        """Record an item drawn in this frame."""
+        self._current.append((key, tuple(rect)))
+
+    def update(self):
+        """
+        Push the rects of the items that appeared, disappeared, moved or
+        changed images, or the whole screen if they cover too much of it.
+        """
+        if self.full_redraw:
+            dirty = None
+        else:
+            last = set(self._last)
+            current = set(self._current)
+            dirty = [rect for key, rect in last.symmetric_difference(current)]
+            area = sum(rect[2] * rect[3] for rect in dirty)
+            if area > self.settings.dirty_rect_threshold * self.screen_area:
+                dirty = None
+
+        if dirty is None:
+            self.scaler.present()
+            self.pixels_pushed = self.screen_area
+            self.full_frames += 1
+        else:
+            if dirty:
+                self.scaler.present(dirty)
+            self.pixels_pushed = area
+
+        self.total_pixels_pushed += self.pixels_pushed
+        self.frames += 1
+        self.full_redraw = False
+        self._last = self._current
+
+    def stats(self):
+        """Return the pixels pushed in the last frame and on average."""
+        return {
+            "pixels_pushed": self.pixels_pushed,
+            "average_pixels_pushed": (
+                self.total_pixels_pushed / self.frames if self.frames else 0
+            ),
+            "screen_pixels": self.screen_area,
+            "full_frames": self.full_frames,
+            "frames": self.frames,
+        }
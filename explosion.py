@@ -1,65 +1,101 @@
-import pygame
-from pygame.sprite import Sprite
-
-
-class Explosion(Sprite):
+class Explosion:
     """A class to represent an explosion animation."""
 
-    def __init__(self, ai_game, center):
-        """Initialize the explosion animation."""
-        super().__init__()
-        self.screen = ai_game.screen
-        self.settings = ai_game.settings
-
-        # Define the number of small sprites in horizontal and vertical.
-        self.num_horizontal_small_sprites = 13
-        self.num_vertical_small_sprites = 1
-
-        self.big_image = pygame.image.load(ai_game.resource_path("assets/images/explosion.png"))
-
-        # Define the size of each small sprites.
-        self.width_sprite = self.big_image.get_width() // self.num_horizontal_small_sprites
-        self.height_sprite = self.big_image.get_height() // self.num_vertical_small_sprites
-
-        self.rect = self.big_image.get_rect()
-        self.rect.center = center
-
-        # Initiate the frames variable
-        self.frames = []
-        
-
-        # This loop store all small sprites in "sprites" list.
-        for row in range(self.num_vertical_small_sprites):
-            for col in range(self.num_horizontal_small_sprites):
-                x = col * self.width_sprite
-                y = row * self.height_sprite
-                self.sprite = self.big_image.subsurface(
-                    pygame.Rect(x, y, self.width_sprite, self.height_sprite)
-                )
-                self.frames.append(self.sprite)
+    __slots__ = (
+        "frames",
+        "animation_speed",
+        "current_frame",
+        "image",
+        "rect",
+        "last_update",
+    )
 
+    def __init__(self, frames, animation_speed):
+        """Initialize the explosion animation with shared frames."""
+        self.frames = frames
+        self.animation_speed = animation_speed
         self.current_frame = 0
-        self.image = self.frames[self.current_frame]
-        self.animation_speed = self.settings.explosion_long
-        self.last_update = pygame.time.get_ticks()
+        self.image = self.frames[0]
+        self.rect = self.image.get_rect()
+        self.last_update = 0
 
-    def update(self):
-        """Update the explosion animation."""
-        # Get the time of now
-        now = pygame.time.get_ticks()
+    def start(self, center, now):
+        """Start the animation again at a new position."""
+        self.current_frame = 0
+        self.image = self.frames[0]
+        self.rect.size = self.image.get_size()
+        self.rect.center = center
+        self.last_update = now
 
+    def update(self, now):
+        """Update the explosion animation and return True once it has ended."""
         # In this if statement we adjust the speed of show the explosion animation
         # and show the frames of animation and adjust the position of the frame.
         if now - self.last_update > self.animation_speed:
             self.last_update = now
             self.current_frame += 1
             if self.current_frame == len(self.frames):
-                self.kill()
+                return True
+            center = self.rect.center
+            self.image = self.frames[self.current_frame]
+            self.rect.size = self.image.get_size()
+            self.rect.center = center
+        return False
+
+
+class ExplosionPool:
+    """A class to recycle explosions instead of making new ones."""
+
+    def __init__(self, ai_game):
+        """Slice the explosion frames once and initialize the pool."""
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        # Define the number of small sprites in horizontal and vertical.
+        self.frames = ai_game.assets.frames("assets/images/explosion.png", 13, 1)
+
+        # Explosions in use are kept at the front of the list.
+        self._explosions = []
+        self.active = 0
+
+    def __len__(self):
+        return self.active
+
+    def sprites(self):
+        """Return a list of the explosions in use."""
+        return self._explosions[: self.active]
+
+    def spawn(self, center, now):
+        """Start an explosion at center, reusing a finished one if possible."""
+        if self.active == len(self._explosions):
+            self._explosions.append(
+                Explosion(self.frames, self.settings.explosion_long)
+            )
+        self._explosions[self.active].start(center, now)
+        self.active += 1
+
+    def update(self, now):
+        """Update every explosion and free the ones which have ended."""
+        explosions = self._explosions
+        index = 0
+        while index < self.active:
+            explosion = explosions[index]
+            if explosion.update(now):
+                # Swap the last explosion in use into this slot.
+                self.active -= 1
+                explosions[index] = explosions[self.active]
+                explosions[self.active] = explosion
             else:
-                center = self.rect.center
-                self.image = self.frames[self.current_frame]
-                self.rect = self.image.get_rect()
-                self.rect.center = center
-    
+                index += 1
 
+    def empty(self):
+        """Free every explosion."""
+        self.active = 0
 
+    def blit_items(self):
+        """Return the (image, rect) pairs of the explosions in use."""
+        explosions = self._explosions
+        return [
+            (explosions[index].image, explosions[index].rect)
+            for index in range(self.active)
+        ]
@@ -0,0 +1,230 @@
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    # The fleet engine is optional; without NumPy the game moves every
+    #   alien on its own.
+    np = None
+
+# Older pygame releases truncate float rect positions, newer ones round
+#   half away from zero; the fleet rounds its positions the same way.
+_probe = pygame.Rect(0, 0, 0, 0)
+_probe.x = 0.5
+ROUNDS_RECT_POSITIONS = _probe.x == 1
+del _probe
+
+
+class Fleet:
+    """
+    A class to move the whole alien fleet with array operations.
+
+    The arrays hold the positions; the rects of the aliens are only brought
+    up to date when something looks at them, through sync_rect() and
+    sync_rects().
+    """
+
+    def __init__(self, ai_game):
+        """Initialize the fleet arrays."""
+        self.settings = ai_game.settings
+        self.bounds = ai_game.fleet_bounds
+
+        self.aliens = []
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.alive = np.zeros(0, dtype=bool)
+        self.alien_width, self.alien_height = 0, 0
+        # False once the fleet has moved since the rects were synced.
+        self.rects_synced = True
+
+    @staticmethod
+    def available():
+        """Return True if NumPy is installed."""
+        return np is not None
+
+    def build(self, aliens):
+        """Store the positions of a new fleet in contiguous arrays."""
+        self.aliens = list(aliens)
+        self.x = np.array([alien.x for alien in self.aliens], dtype=float)
+        self.y = np.array([alien.rect.y for alien in self.aliens], dtype=float)
+        self.alive = np.ones(len(self.aliens), dtype=bool)
+
+        for index, alien in enumerate(self.aliens):
+            alien.fleet_index = index
+        if self.aliens:
+            self.alien_width, self.alien_height = self.aliens[0].rect.size
+        self.rects_synced = True
+        self._reset_bounds()
+
+    def _reset_bounds(self):
+        """Recompute the bounding box from the living aliens."""
+        self.bounds.reset(
+            self.x[self.alive].tolist(),
+            self.y[self.alive].tolist(),
+            self.alien_width,
+            self.alien_height,
+        )
+
+    def remove(self, aliens):
+        """Mark aliens which were shot down as dead."""
+        indices = [alien.fleet_index for alien in aliens]
+        self.alive[indices] = False
+
+        # Only an alien on the bounding box can change it.
+        if self.bounds.touches(self.x[indices].tolist(), self.y[indices].tolist()):
+            self._reset_bounds()
+
+    def update(self):
+        """Move the fleet, and drop it and change its direction at an edge."""
+        if self.bounds.empty:
+            return
+
+        if self.bounds.at_edge():
+            self.y += self.settings.fleet_drop_speed
+            self.bounds.drop(self.settings.fleet_drop_speed)
+            self.settings.fleet_direction *= -1
+
+        dx = (
+            self.settings.alien_speed
+            * self.settings.time_step
+            * self.settings.fleet_direction
+        )
+        self.x += dx
+        self.bounds.move(dx)
+        self.rects_synced = False
+
+    def _positions(self, indices):
+        """Return the rect lefts and tops of the aliens at indices as lists."""
+        x = self.x[indices]
+        if ROUNDS_RECT_POSITIONS:
+            x = np.copysign(np.floor(np.abs(x) + 0.5), x)
+        lefts = x.astype(int).tolist()
+        tops = self.y[indices].astype(int).tolist()
+        return lefts, tops
+
+    def sync_rect(self, alien):
+        """Copy the array position of one alien to its rect."""
+        index = alien.fleet_index
+        alien.rect.topleft = (self.x[index], int(self.y[index]))
+
+    def sync_rects(self):
+        """
+        Copy the array positions to the rects of every living alien. The
+        rects aren't moved with the fleet, so this is only done when all
+        of them are needed, and only once after the fleet has moved.
+        """
+        if self.rects_synced:
+            return
+        self.rects_synced = True
+        indices = np.flatnonzero(self.alive)
+        lefts, tops = self._positions(indices)
+        aliens = self.aliens
+        for index, left, top in zip(indices.tolist(), lefts, tops):
+            aliens[index].rect.topleft = (left, top)
+
+    def blit_items(self, dx=0):
+        """Return the (image, rect) pairs of the living aliens, dx pixels right."""
+        if self.bounds.empty:
+            return []
+        lefts, tops = self._positions(np.flatnonzero(self.alive))
+        # Every alien uses the same cached image.
+        image = self.aliens[0].image
+        width, height = self.alien_width, self.alien_height
+        return [
+            (image, (left + dx, top, width, height)) for left, top in zip(lefts, tops)
+        ]
+
+
+class FleetBounds:
+    """A class to track the bounding box of the fleet as it moves."""
+
+    def __init__(self, ai_game):
+        """Initialize an empty bounding box."""
+        self.settings = ai_game.settings
+        self.screen_rect = ai_game.screen.get_rect()
+
+        # A rect used to round float positions the same way alien rects do.
+        self._probe = pygame.Rect(0, 0, 0, 0)
+        self.empty = True
+
+    def reset(self, xs, tops, alien_width, alien_height):
+        """Recompute the bounding box from the positions of the living aliens."""
+        xs, tops = list(xs), list(tops)
+        self.empty = not xs
+        if self.empty:
+            return
+
+        # The fleet moves as a rigid body, so the left and right bounds
+        #   follow the exact float positions of the outermost aliens.
+        self.left_x = min(xs)
+        self.right_x = max(xs)
+        self.top = int(min(tops))
+        self.bottom = int(max(tops)) + alien_height
+        self.alien_width = alien_width
+        self.alien_height = alien_height
+
+    def reset_from_sprites(self, aliens):
+        """Recompute the bounding box from a group of alien sprites."""
+        sprites = aliens.sprites()
+        width, height = sprites[0].rect.size if sprites else (0, 0)
+        self.reset(
+            (alien.x for alien in sprites),
+            (alien.rect.y for alien in sprites),
+            width,
+            height,
+        )
+
+    def move(self, dx):
+        """Move the bounding box horizontally."""
+        if not self.empty:
+            self.left_x += dx
+            self.right_x += dx
+
+    def drop(self, dy):
+        """Move the bounding box down."""
+        if not self.empty:
+            self.top += dy
+            self.bottom += dy
+
+    @property
+    def left(self):
+        """Return the left edge of the leftmost alien's rect."""
+        self._probe.x = self.left_x
+        return self._probe.x
+
+    @property
+    def right(self):
+        """Return the right edge of the rightmost alien's rect."""
+        self._probe.x = self.right_x
+        return self._probe.x + self.alien_width
+
+    @property
+    def rect(self):
+        """Return the bounding box as a rect."""
+        left = self.left
+        return pygame.Rect(left, self.top, self.right - left, self.bottom - self.top)
+
+    def touches(self, xs, tops):
+        """Return True if any of the positions lies on the bounding box."""
+        if self.empty:
+            return False
+        bottom_top = self.bottom - self.alien_height
+        for x, top in zip(xs, tops):
+            if (
+                x == self.left_x
+                or x == self.right_x
+                or top == self.top
+                or top == bottom_top
+            ):
+                return True
+        return False
+
+    def at_edge(self):
+        """Return True if the fleet is at an edge of the screen."""
+        if self.empty:
+            return False
+        return self.right >= self.screen_rect.right or self.left <= 0
+
+    def at_bottom(self):
+        """Return True if the fleet has reached the bottom of the screen."""
+        return not self.empty and self.bottom >= self.settings.screen_height
@@ -0,0 +1,36 @@
+from time import perf_counter
+
+import pygame.font
+
+
+class FontRegistry:
+    """A class to load every font only once, when it is first used."""
+
+    # The loaded fonts and how long each took, shared by every game.
+    _fonts = {}
+    load_times = {}
+
+    def get(self, name=None, size=48, bold=False, italic=False):
+        """Return the font, loading it the first time it is asked for."""
+        key = (name, size, bold, italic)
+        font = self._fonts.get(key)
+        if font is None:
+            start = perf_counter()
+            if name is None:
+                # The default font needs no system font lookup, which
+                #   SysFont() would start with.
+                font = pygame.font.Font(None, size)
+                font.set_bold(bold)
+                font.set_italic(italic)
+            else:
+                font = pygame.font.SysFont(name, size, bold, italic)
+            self.load_times[key] = perf_counter() - start
+            self._fonts[key] = font
+        return font
+
+    def stats(self):
+        """Return the number of loaded fonts and their total load time in ms."""
+        return {
+            "fonts": len(self._fonts),
+            "load_ms": 1000 * sum(self.load_times.values()),
+        }
@@ -0,0 +1,80 @@
+from time import perf_counter, process_time
+
+import pygame
+
+
+class FramePacer:
+    """
+    A class to wait for the next frame: at the frame rate while the game
+    moves, and for input while nothing on the screen changes.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize the CPU time accounting of every mode."""
+        self.settings = ai_game.settings
+
+        # The event which ended the last wait, for the next frame to
+        #   handle, and when the wait returned.
+        self.waited_events = []
+        self.waited_at = None
+
+        # The wall and CPU seconds spent in every mode.
+        self.wall_time = {}
+        self.cpu_time = {}
+        self._wall = perf_counter()
+        self._cpu = process_time()
+
+    def tick(self, clock, mode):
+        """
+        Wait for the next frame and return the ms of game time it brings.
+        Mode "idle" waits until there is input, "fast" doesn't wait, and
+        "menu" and "play" wait for the frame rate.
+        """
+        if mode == "idle":
+            event = pygame.event.wait(self.settings.idle_timeout)
+            if event.type != pygame.NOEVENT:
+                self.waited_events.append(event)
+                self.waited_at = perf_counter()
+            clock.tick()
+            # Nothing moves while the game waits, so no time passes for it.
+            frame_ms = 0
+        elif mode == "fast":
+            frame_ms = clock.tick()
+        elif mode == "play" and self.settings.busy_loop_pacing:
+            frame_ms = clock.tick_busy_loop(self.settings.frame_rate)
+        else:
+            frame_ms = clock.tick(self.settings.frame_rate)
+
+        self._account(mode)
+        return frame_ms
+
+    def take_waited_events(self):
+        """Return the events which ended a wait, and forget them."""
+        events = self.waited_events
+        self.waited_events = []
+        return events
+
+    def _account(self, mode):
+        """Add the time since the last frame to mode."""
+        wall = perf_counter()
+        cpu = process_time()
+        self.wall_time[mode] = self.wall_time.get(mode, 0.0) + wall - self._wall
+        self.cpu_time[mode] = self.cpu_time.get(mode, 0.0) + cpu - self._cpu
+        self._wall = wall
+        self._cpu = cpu
+
+    def cpu_per_second(self):
+        """Return the ms of CPU time used per second in every mode."""
+        return {
+            mode: 1000 * self.cpu_time[mode] / wall
+            for mode, wall in self.wall_time.items()
+            if wall > 0
+        }
+
+    def report(self):
+        """Return the time spent and the CPU time used in every mode as text."""
+        cpu_per_second = self.cpu_per_second()
+        return "\n".join(
+            f"{mode:<8}{self.wall_time[mode]:8.1f} s{cpu:9.1f} ms CPU per second"
+            for mode, cpu in cpu_per_second.items()
+        )
@@ -0,0 +1,152 @@
+import csv
+from array import array
+from time import perf_counter
+
+
+class FrameProfiler:
+    """A class to time each phase of the main loop over the last frames."""
+
+    PHASES = (
+        "events",
+        "ship",
+        "bullets",
+        "collisions",
+        "aliens",
+        "alien_fire",
+        "explosions",
+        "ship_explosion",
+        "screen",
+        "tick",
+    )
+
+    def __init__(self, ai_game):
+        """Initialize the ring buffer; profiling starts off unless it's set."""
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.enabled = self.settings.profiler_enabled
+        self.show_overlay = self.enabled
+
+        # One ring buffer of seconds per phase, holding the last frames.
+        self.capacity = self.settings.profiler_frames
+        self.timings = {
+            phase: array("d", bytes(8 * self.capacity)) for phase in self.PHASES
+        }
+        self.frame = 0
+        self.frames_recorded = 0
+        self._last = 0.0
+
+        # The overlay text is only rendered again every refresh_frames.
+        self.font = ai_game.fonts.get(None, 24)
+        self.text_color = (30, 30, 30)
+        self.refresh_frames = 30
+        self.overlay_images = []
+
+    def toggle(self):
+        """Turn profiling and its overlay on or off."""
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        self._last = perf_counter()
+
+    def begin_frame(self):
+        """Start timing a new frame."""
+        if not self.enabled:
+            return
+        self.frame = (self.frame + 1) % self.capacity
+        for timings in self.timings.values():
+            timings[self.frame] = 0.0
+        self.frames_recorded += 1
+        self._last = perf_counter()
+
+    def lap(self, phase):
+        """Add the time since the last lap to phase."""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self.timings[phase][self.frame] += now - self._last
+        self._last = now
+
+    def _frames(self):
+        """Return the ring buffer indices of the recorded frames, oldest first."""
+        count = min(self.frames_recorded, self.capacity)
+        first = self.frame - count + 1
+        return [(first + offset) % self.capacity for offset in range(count)]
+
+    def frame_times(self):
+        """Return the total time of every recorded frame in ms."""
+        return [
+            1000 * sum(timings[index] for timings in self.timings.values())
+            for index in self._frames()
+        ]
+
+    def percentiles(self, percents=(50, 95, 99)):
+        """Return the frame time percentiles in ms."""
+        times = sorted(self.frame_times())
+        if not times:
+            return {percent: 0.0 for percent in percents}
+        return {
+            percent: times[min(len(times) - 1, len(times) * percent // 100)]
+            for percent in percents
+        }
+
+    def slowest_phase(self):
+        """Return the phase with the largest mean time and that time in ms."""
+        indices = self._frames()
+        if not indices:
+            return None, 0.0
+        means = {
+            phase: 1000 * sum(timings[index] for index in indices) / len(indices)
+            for phase, timings in self.timings.items()
+        }
+        phase = max(means, key=means.get)
+        return phase, means[phase]
+
+    def draw(self):
+        """Draw the frame time percentiles and the slowest phase."""
+        if not self.show_overlay:
+            return
+        if not self.overlay_images or self.frames_recorded % self.refresh_frames == 0:
+            self._prep_overlay()
+        for image, rect in self.overlay_items():
+            self.screen.blit(image, rect)
+
+    def overlay_items(self):
+        """Return the overlay images with the rects they are drawn in."""
+        items = []
+        y = self.screen.get_rect().bottom - 10
+        for image in reversed(self.overlay_images):
+            y -= image.get_height()
+            items.append((image, image.get_rect(topleft=(10, y))))
+        return items
+
+    def _prep_overlay(self):
+        """Turn the profile into rendered images."""
+        percentiles = self.percentiles()
+        phase, mean = self.slowest_phase()
+        lines = [
+            "frame p50 {:.2f}  p95 {:.2f}  p99 {:.2f} ms".format(
+                percentiles[50], percentiles[95], percentiles[99]
+            ),
+            f"slowest: {phase} {mean:.2f} ms",
+        ]
+        self.overlay_images = [
+            self.font.render(line, True, self.text_color, self.settings.bg_color)
+            for line in lines
+        ]
+
+    def export_csv(self, path):
+        """Write the recorded frames to a CSV file, one row per frame."""
+        indices = self._frames()
+        if not indices:
+            return
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(("frame",) + tuple(f"{phase}_ms" for phase in self.PHASES))
+            first_frame = self.frames_recorded - len(indices)
+            for number, index in enumerate(indices):
+                writer.writerow(
+                    [first_frame + number]
+                    + [
+                        f"{1000 * self.timings[phase][index]:.4f}"
+                        for phase in self.PHASES
+                    ]
+                )
@@ -0,0 +1,22 @@
+class GameState:
+    """A class to track what the game is doing and when a pause ends."""
+
+    MENU = "menu"
+    PLAYING = "playing"
+    RESPAWN = "respawn"
+    LEVEL_TRANSITION = "level_transition"
+
+    def __init__(self):
+        """Start the game in the menu."""
+        self.current = self.MENU
+        self.ends_at = None
+
+    def enter(self, state, now=0, duration=None):
+        """Switch to a state; a timed state goes back to playing after duration ms."""
+        self.current = state
+        self.ends_at = None if duration is None else now + duration
+
+    def update(self, now):
+        """Go back to playing once a timed state has run out."""
+        if self.ends_at is not None and now >= self.ends_at:
+            self.enter(self.PLAYING)
@@ -1,5 +1,3 @@
-from pathlib import Path
-
 class GameStats:
     """Track statistics for Alien Invasion."""
 
@@ -9,7 +7,7 @@ class GameStats:
         self.settings = ai_game.settings
         self.reset_status()
         # High score should never be reset.
-        self.high_score = self._read_high_score_from_file()
+        self.high_score = ai_game.scores.high_score(self.settings.difficulty)
 
 
     def reset_status(self):
@@ -18,16 +16,6 @@ class GameStats:
         self.score = 0
         self.level = 1
 
-    def _read_high_score_from_file(self):
-        """Read the high_score from file and load it."""
-        path = Path(self.ai_game.resource_path("assets/high_score"))
-        try:
-            content = path.read_text()
-        except FileNotFoundError:
-            path.write_text("0")
-            content = path.read_text()
-        content = int(content)
-        return content
 
 
          
\ No newline at end of file
@@ -0,0 +1,87 @@
+import pygame
+
+
+class GlyphAtlas:
+    """A class to render each glyph and label of a font only once."""
+
+    # One atlas per font, text color and background color.
+    _atlases = {}
+
+    def __init__(self, font, text_color, bg_color):
+        """Initialize empty glyph and label caches."""
+        self.font = font
+        self.text_color = text_color
+        self.bg_color = bg_color
+        self.height = font.get_height()
+
+        self.glyphs = {}
+        self.labels = {}
+
+        # Keep the last composed texts; levels and scores come back often.
+        self.texts = {}
+        self.max_texts = 256
+
+    @classmethod
+    def get(cls, font, text_color, bg_color):
+        """Return the shared atlas of a font and colors."""
+        key = (font, tuple(text_color), tuple(bg_color))
+        atlas = cls._atlases.get(key)
+        if atlas is None:
+            atlas = cls._atlases[key] = cls(font, text_color, bg_color)
+        return atlas
+
+    def glyph(self, char):
+        """Return the rendered image of one character."""
+        image = self.glyphs.get(char)
+        if image is None:
+            image = self._convert(
+                self.font.render(char, True, self.text_color, self.bg_color)
+            )
+            self.glyphs[char] = image
+        return image
+
+    def render(self, text):
+        """Return an image of text composed from the cached glyphs."""
+        image = self.texts.get(text)
+        if image is not None:
+            return image
+
+        x = 0
+        blits = []
+        covered = True
+        for char in text:
+            glyph = self.glyph(char)
+            blits.append((glyph, (x, 0)))
+            x += glyph.get_width()
+            covered = covered and glyph.get_height() >= self.height
+
+        display = pygame.display.get_surface()
+        if display is None:
+            image = pygame.Surface((x, self.height))
+        else:
+            # Make the image in the display pixel format right away.
+            image = pygame.Surface((x, self.height), 0, display)
+        if not covered:
+            image.fill(self.bg_color)
+        image.blits(blits, doreturn=False)
+
+        if len(self.texts) >= self.max_texts:
+            self.texts.clear()
+        self.texts[text] = image
+        return image
+
+    def _convert(self, image):
+        """Convert an image to the display pixel format for fast blitting."""
+        if pygame.display.get_surface() is None:
+            return image
+        return image.convert()
+
+    def label(self, text):
+        """Return the rendered image of a whole label, like a button's message."""
+        image = self.labels.get(text)
+        if image is None:
+            image = self._convert(
+                self.font.render(text, True, self.text_color, self.bg_color)
+            )
+            self.labels[text] = image
+        return image
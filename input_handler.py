@@ -0,0 +1,121 @@
+from collections import deque
+from time import perf_counter
+
+import pygame
+
+
+class InputHandler:
+    """
+    A class to turn input events into game actions through a key-binding
+    table, keeping track of the actions whose keys are held down.
+    """
+
+    # The only events the game responds to; SDL drops the others.
+    EVENT_TYPES = (
+        pygame.QUIT,
+        pygame.KEYDOWN,
+        pygame.KEYUP,
+        pygame.MOUSEBUTTONDOWN,
+    )
+
+    # The action of every key.
+    KEY_BINDINGS = {
+        pygame.K_RIGHT: "right",
+        pygame.K_LEFT: "left",
+        pygame.K_SPACE: "fire",
+        pygame.K_p: "play",
+        pygame.K_q: "quit",
+        pygame.K_F3: "profiler",
+    }
+
+    def __init__(self, on_press, on_release, on_click, on_quit, max_latencies=1000):
+        """
+        Bind the keys to the functions which on_press and on_release map
+        their actions to; on_click is called with the position of a mouse
+        click, and on_quit when the window is closed.
+        """
+        # Look the functions up by key, not by action, once.
+        self.keydown = {
+            key: on_press[action]
+            for key, action in self.KEY_BINDINGS.items()
+            if action in on_press
+        }
+        self.keyup = {
+            key: on_release[action]
+            for key, action in self.KEY_BINDINGS.items()
+            if action in on_release
+        }
+        self.on_click = on_click
+        self.on_quit = on_quit
+
+        # The held keys come from the events, not from the keyboard, so a
+        #   replay holds the same keys.
+        self.held_actions = set()
+
+        # Events carry no time, so an input is taken to have arrived at
+        #   the start of the window it arrived in: when the last frame was
+        #   shown, or when a wait for input returned. The latencies are
+        #   from there to when the input is shown, in seconds.
+        self.window_start = perf_counter()
+        self._unshown = []
+        self.latencies = deque(maxlen=max_latencies)
+
+    @classmethod
+    def allow_events(cls):
+        """Let only the events the game responds to into the event queue."""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(cls.EVENT_TYPES)
+
+    def held(self, action):
+        """Return True if the key of action is held down."""
+        return action in self.held_actions
+
+    def arrived(self, at):
+        """Start the arrival window of the next inputs at time at."""
+        self.window_start = max(self.window_start, at)
+
+    def handle(self, events):
+        """Respond to the events of a frame."""
+        for event in events:
+            if event.type != pygame.QUIT:
+                self._unshown.append(self.window_start)
+            if event.type == pygame.KEYDOWN:
+                action = self.KEY_BINDINGS.get(event.key)
+                if action is not None:
+                    self.held_actions.add(action)
+                    function = self.keydown.get(event.key)
+                    if function is not None:
+                        function()
+            elif event.type == pygame.KEYUP:
+                action = self.KEY_BINDINGS.get(event.key)
+                if action is not None:
+                    self.held_actions.discard(action)
+                    function = self.keyup.get(event.key)
+                    if function is not None:
+                        function()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.on_click(event.pos)
+            elif event.type == pygame.QUIT:
+                self.on_quit()
+
+    def shown(self):
+        """
+        Record the latency of the inputs which the display now shows, and
+        start the arrival window of the next ones.
+        """
+        now = perf_counter()
+        if self._unshown:
+            self.latencies.extend(now - arrived for arrived in self._unshown)
+            self._unshown.clear()
+        self.window_start = now
+
+    def latency_percentiles(self, percents=(50, 95, 99)):
+        """Return the input-to-display latency percentiles in ms."""
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {percent: 0.0 for percent in percents}
+        return {
+            percent: 1000
+            * latencies[min(len(latencies) - 1, len(latencies) * percent // 100)]
+            for percent in percents
+        }
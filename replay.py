@@ -0,0 +1,100 @@
+import gzip
+import json
+import struct
+
+import pygame
+
+
+# Only the events the game responds to are recorded.
+RECORDED_EVENTS = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN,
+)
+
+# Every frame is stored as its number of time steps and of events, and
+#   every event as its type, key (or mouse button) and mouse position.
+FRAME = struct.Struct("<BH")
+EVENT = struct.Struct("<HIhh")
+
+VERSION = 1
+
+
+class InputRecorder:
+    """A class to record the random seed and the input of every frame."""
+
+    def __init__(self, path, ai_game):
+        """Open the recording and write its header."""
+        self.file = gzip.open(path, "wb")
+        header = {
+            "version": VERSION,
+            "seed": ai_game.seed,
+            "screen": [ai_game.settings.screen_width, ai_game.settings.screen_height],
+        }
+        self.file.write(json.dumps(header).encode() + b"\n")
+        self.frames = 0
+        self._events = []
+
+    def record_events(self, events):
+        """Remember the events of the current frame."""
+        for event in events:
+            if event.type not in RECORDED_EVENTS:
+                continue
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                key, (x, y) = event.button, event.pos
+            else:
+                key, x, y = getattr(event, "key", 0), 0, 0
+            self._events.append(EVENT.pack(event.type, key, x, y))
+
+    def end_frame(self, steps):
+        """Write the frame with the number of time steps it ran."""
+        self.file.write(FRAME.pack(steps, len(self._events)))
+        self.file.write(b"".join(self._events))
+        self._events = []
+        self.frames += 1
+
+    def close(self):
+        """Finish the recording."""
+        self.file.close()
+
+
+class InputPlayer:
+    """A class to play back a recording frame by frame."""
+
+    def __init__(self, path, fast=False):
+        """Read the header; fast replays don't wait for the frame rate."""
+        self.file = gzip.open(path, "rb")
+        self.header = json.loads(self.file.readline())
+        if self.header["version"] != VERSION:
+            raise ValueError(f"Unsupported recording version {self.header['version']}")
+        self.seed = self.header["seed"]
+        self.fast = fast
+        self.frames = 0
+        self.steps = 0
+        self.finished = False
+
+    def next_frame(self):
+        """Return the events of the next frame, or None at the end."""
+        data = self.file.read(FRAME.size)
+        if len(data) < FRAME.size:
+            self.finished = True
+            return None
+        self.steps, count = FRAME.unpack(data)
+
+        events = []
+        for index in range(count):
+            event_type, key, x, y = EVENT.unpack(self.file.read(EVENT.size))
+            if event_type == pygame.MOUSEBUTTONDOWN:
+                attributes = {"button": key, "pos": (x, y)}
+            elif event_type == pygame.QUIT:
+                attributes = {}
+            else:
+                attributes = {"key": key}
+            events.append(pygame.event.Event(event_type, attributes))
+        self.frames += 1
+        return events
+
+    def close(self):
+        """Close the recording."""
+        self.file.close()
@@ -0,0 +1,168 @@
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from platformdirs import user_data_dir
+
+
+SCHEMA_VERSION = 1
+
+
+class ScoreStore:
+    """
+    A class to keep the best scores of every difficulty in a SQLite
+    database in the user data directory.
+
+    The leaderboards are read once when the store is opened and then kept
+    in memory, so the game never waits for the disk; new scores are
+    written on a worker thread.
+    """
+
+    def __init__(self, path=None, top_n=10, legacy_path=None, default_difficulty=""):
+        """
+        Open the database at path (scores.db in the user data directory by
+        default) and read the leaderboards. A high score in the legacy
+        high_score file at legacy_path is imported once, for the default
+        difficulty. With path False nothing is stored on disk.
+        """
+        if path is None:
+            path = Path(user_data_dir("alien_invasion", False)) / "scores.db"
+        self.path = path
+        self.top_n = top_n
+        self.leaderboards = {}
+
+        self._jobs = queue.Queue()
+        self._thread = None
+        if not self.path:
+            return
+
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = self._connect()
+            try:
+                self._migrate(connection, legacy_path, default_difficulty)
+                self._read_leaderboards(connection)
+            finally:
+                connection.close()
+        except (OSError, sqlite3.Error) as error:
+            # Play on without saving scores rather than not at all.
+            print(f"Scores won't be saved: {error}")
+            self.path = False
+            return
+
+        self._thread = threading.Thread(target=self._write_scores, daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        """Open a connection to the database in WAL mode."""
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _migrate(self, connection, legacy_path, default_difficulty):
+        """Create the tables and import the legacy high score once."""
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version >= SCHEMA_VERSION:
+            return
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "id INTEGER PRIMARY KEY, "
+                "difficulty TEXT NOT NULL, "
+                "score INTEGER NOT NULL, "
+                "level INTEGER NOT NULL, "
+                "played_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS scores_by_difficulty "
+                "ON scores (difficulty, score DESC)"
+            )
+            legacy_score = self._read_legacy_score(legacy_path)
+            if legacy_score:
+                connection.execute(
+                    "INSERT INTO scores (difficulty, score, level, played_at) "
+                    "VALUES (?, ?, 0, ?)",
+                    (default_difficulty, legacy_score, time.time()),
+                )
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _read_legacy_score(self, legacy_path):
+        """Return the score in the legacy high_score file, or 0."""
+        if legacy_path is None:
+            return 0
+        try:
+            return int(Path(legacy_path).read_text())
+        except (OSError, ValueError):
+            return 0
+
+    def _read_leaderboards(self, connection):
+        """Read the top_n scores of every difficulty."""
+        difficulties = [
+            row[0]
+            for row in connection.execute("SELECT DISTINCT difficulty FROM scores")
+        ]
+        for difficulty in difficulties:
+            self.leaderboards[difficulty] = connection.execute(
+                "SELECT score, level, played_at FROM scores WHERE difficulty = ? "
+                "ORDER BY score DESC LIMIT ?",
+                (difficulty, self.top_n),
+            ).fetchall()
+
+    def high_score(self, difficulty):
+        """Return the best score of a difficulty."""
+        leaderboard = self.leaderboards.get(difficulty)
+        return leaderboard[0][0] if leaderboard else 0
+
+    def leaderboard(self, difficulty):
+        """Return the best (score, level, played_at) of a difficulty, best first."""
+        return list(self.leaderboards.get(difficulty, ()))
+
+    def submit(self, difficulty, score, level):
+        """Add the score of a finished game and write it in the background."""
+        if score <= 0:
+            return
+        entry = (score, level, time.time())
+        leaderboard = self.leaderboards.setdefault(difficulty, [])
+        leaderboard.append(entry)
+        leaderboard.sort(key=lambda row: row[0], reverse=True)
+        del leaderboard[self.top_n :]
+        if self._thread is not None:
+            self._jobs.put((difficulty,) + entry)
+
+    def _write_scores(self):
+        """Write the submitted scores, each game in one transaction."""
+        connection = self._connect()
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            difficulty = job[0]
+            try:
+                with connection:
+                    connection.execute(
+                        "INSERT INTO scores (difficulty, score, level, played_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        job,
+                    )
+                    # Only keep the leaderboard.
+                    connection.execute(
+                        "DELETE FROM scores WHERE difficulty = ? AND id NOT IN ("
+                        "SELECT id FROM scores WHERE difficulty = ? "
+                        "ORDER BY score DESC LIMIT ?)",
+                        (difficulty, difficulty, self.top_n),
+                    )
+            except sqlite3.Error as error:
+                print(f"Couldn't save a score: {error}")
+            finally:
+                self._jobs.task_done()
+        connection.close()
+
+    def close(self):
+        """Wait for the scores to be written and close the store."""
+        if self._thread is not None:
+            self._jobs.put(None)
+            self._thread.join()
+            self._thread = None
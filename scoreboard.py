@@ -1,7 +1,6 @@
-import pygame.font
-from pygame.sprite import Group
+import pygame
 
-from ship import Ship
+from glyph_atlas import GlyphAtlas
 
 class Scoreboard:
     """A class to report scoring information."""
@@ -16,7 +15,13 @@ class Scoreboard:
 
         # Font settings for scoring information.
         self.text_color = (30, 30, 30)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.fonts.get(None, 48)
+        # Numbers are composed from glyphs which are rendered only once.
+        self.atlas = GlyphAtlas.get(self.font, self.text_color, self.settings.bg_color)
+
+        # The ship icons are cut from a strip which is built only once.
+        self.ship_image = ai_game.assets.image("assets/images/ship.bmp")
+        self.ships_strip = None
 
         # Prepare the initial score image.
         self.prep_image()
@@ -32,10 +37,8 @@ class Scoreboard:
         """Turn the score into a rendered image."""
         round_score = round(self.stats.score, -1)
         score_str = f"{round_score:,}"
-        self.score_image = self.font.render(score_str, True,
-                                            self.text_color,
-                                            self.settings.bg_color)
-        
+        self.score_image = self.atlas.render(score_str)
+
         # Display the score at the top right of the screen.
         self.score_rect = self.score_image.get_rect()
         self.score_rect.right = self.screen_rect.right - 20
@@ -45,9 +48,8 @@ class Scoreboard:
         """Turn the high score into a rendered image."""
         high_score = round(self.stats.high_score, -1)
         high_score_str = f"{high_score:,}"
-        self.high_score_image = self.font.render(high_score_str, True,
-                self.text_color, self.settings.bg_color)
-        
+        self.high_score_image = self.atlas.render(high_score_str)
+
         # Center the high score at the top of the screen.
         self.high_score_rect = self.high_score_image.get_rect()
         self.high_score_rect.centerx = self.screen_rect.centerx
@@ -58,7 +60,7 @@ class Scoreboard:
         self.screen.blit(self.score_image, self.score_rect)
         self.screen.blit(self.high_score_image, self.high_score_rect)
         self.screen.blit(self.level_image, self.level_rect)
-        self.ships.draw(self.screen)
+        self.screen.blit(self.ships_strip, self.ships_rect, self.ships_area)
 
     def check_high_score(self):
         """Check to see if there's a new high score."""
@@ -70,8 +72,7 @@ class Scoreboard:
         """Turn the level into a rendered image."""
         level_str = str(self.stats.level)
 
-        self.level_image = self.font.render(level_str, True, 
-                self.text_color, self.settings.bg_color)
+        self.level_image = self.atlas.render(level_str)
 
         # Position the level below the score.
         self.level_rect = self.level_image.get_rect()
@@ -80,9 +81,23 @@ class Scoreboard:
 
     def prep_ships(self):
         """Show how many ships are left."""
-        self.ships = Group()
-        for ship_number in range(self.stats.ships_left):
-            ship = Ship(self.ai_game)
-            ship.rect.x = 10 + ship_number * ship.rect.width
-            ship.rect.y = 10
-            self.ships.add(ship)
\ No newline at end of file
+        ships_left = max(self.stats.ships_left, 0)
+        width, height = self.ship_image.get_size()
+        if (
+            self.ships_strip is None
+            or self.ships_strip.get_width() < ships_left * width
+        ):
+            self._build_ships_strip(max(ships_left, self.settings.ship_limit))
+
+        # Show as much of the strip as there are ships left.
+        self.ships_area = pygame.Rect(0, 0, ships_left * width, height)
+        self.ships_rect = self.ships_area.move(10, 10)
+
+    def _build_ships_strip(self, count):
+        """Build an image of count ship icons side by side."""
+        width, height = self.ship_image.get_size()
+        self.ships_strip = pygame.Surface((count * width, height))
+        self.ships_strip.blits(
+            [(self.ship_image, (number * width, 0)) for number in range(count)],
+            doreturn=False,
+        )
\ No newline at end of file
@@ -0,0 +1,112 @@
+import math
+
+import pygame
+
+
+class ScreenScaler:
+    """
+    A class to draw the game on a screen of the logical resolution and
+    show it on the display, scaled to fit.
+    """
+
+    def __init__(self, display, logical_size, mode="integer"):
+        """
+        Make the logical screen. Mode "integer" scales it by the largest
+        whole factor which fits, "smooth" by as much as fits.
+        """
+        self.display = display
+        self.mode = mode
+        display_rect = display.get_rect()
+        width, height = logical_size
+
+        if display_rect.size == (width, height):
+            # Nothing to scale; the game draws straight to the display.
+            self.scaled = False
+            self.screen = display
+            self.factor = 1
+            self.integer = True
+            self.dest = display_rect
+            return
+
+        self.scaled = True
+        self.screen = pygame.Surface((width, height), 0, display)
+        factor = min(display_rect.width / width, display_rect.height / height)
+        if mode == "integer" and factor >= 1:
+            factor = int(factor)
+        self.factor = factor
+        # Whole factors are scaled with the nearest pixel, which is fast
+        #   and keeps the edges sharp.
+        self.integer = float(factor).is_integer()
+
+        # Center the scaled screen, with black bars around it.
+        self.dest = pygame.Rect(0, 0, round(width * factor), round(height * factor))
+        self.dest.center = display_rect.center
+        self.target = display.subsurface(self.dest)
+        display.fill((0, 0, 0))
+
+    def to_logical(self, pos):
+        """Return the logical position of a position on the display."""
+        x, y = pos
+        return (
+            int((x - self.dest.x) // self.factor),
+            int((y - self.dest.y) // self.factor),
+        )
+
+    def to_display(self, rect):
+        """Return the rect on the display which shows a logical rect."""
+        factor = self.factor
+        left = math.floor(rect.left * factor)
+        top = math.floor(rect.top * factor)
+        display_rect = pygame.Rect(
+            left + self.dest.x,
+            top + self.dest.y,
+            math.ceil(rect.right * factor) - left,
+            math.ceil(rect.bottom * factor) - top,
+        )
+        if not self.integer:
+            # Smoothing blends in the neighbouring pixels.
+            display_rect = display_rect.inflate(2, 2).clip(self.dest)
+        return display_rect
+
+    def present(self, dirty=None):
+        """
+        Show the screen on the display; dirty is a list of the logical
+        rects which changed, or None if all of it may have.
+        """
+        if not self.scaled:
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+            return
+
+        if dirty is None or not self.integer:
+            self._scale(self.screen, self.target)
+            if dirty is None:
+                pygame.display.flip()
+                return
+
+        screen_rect = self.screen.get_rect()
+        display_rects = []
+        for rect in dirty:
+            rect = screen_rect.clip(rect)
+            if not rect:
+                continue
+            display_rect = self.to_display(rect)
+            if self.integer:
+                # Scale just this part of the screen.
+                self._scale(
+                    self.screen.subsurface(rect),
+                    self.target.subsurface(
+                        display_rect.move(-self.dest.x, -self.dest.y)
+                    ),
+                )
+            display_rects.append(display_rect)
+        pygame.display.update(display_rects)
+
+    def _scale(self, source, target):
+        """Scale source to the size of target, drawing it there."""
+        if self.integer:
+            pygame.transform.scale(source, target.get_size(), target)
+        else:
+            pygame.transform.smoothscale(source, target.get_size(), target)
@@ -3,11 +3,41 @@ class Settings:
 
     def __init__(self):
         """Initialize the game's static settings."""
-        # Screen settings
+        # Screen settings; the game is simulated and drawn at this logical
+        #   resolution, whatever the size of the display.
         self.screen_width = 1200
         self.screen_height = 760
+        # In fullscreen SDL scales the screen to the display, with the
+        #   nearest pixel ("integer") or with "smooth" filtering; where it
+        #   can't, the game scales it itself, by whole factors or smoothly
+        #   to fill as much of the display as fits. A window is
+        #   window_scale times the logical resolution.
+        self.fullscreen = True
+        self.window_scale = 1
+        self.scale_mode = "integer"
         self.bg_color = (230, 230, 230)
         self.frame_rate = 60
+        # While the menu doesn't change, wait for input instead of drawing
+        #   it again, waking up every idle_timeout ms. busy_loop_pacing waits
+        #   for the frames of a game with a busy loop, which is more precise
+        #   but keeps a CPU core busy.
+        self.idle_menu = True
+        self.idle_timeout = 500
+        self.busy_loop_pacing = False
+        # Print the CPU time used per second in every pacing mode on exit.
+        self.pacing_report = False
+        # Print the input-to-display latency percentiles on exit.
+        self.latency_report = False
+        # The game is simulated in fixed time steps of 1/simulation_rate
+        #   seconds, whatever the frame rate; after a slow frame it catches
+        #   up with at most max_catchup_steps steps.
+        self.simulation_rate = 60
+        self.time_step = 1 / self.simulation_rate
+        self.max_catchup_steps = 5
+        # Push only the changed parts of the screen to the display, unless
+        #   they cover more than this fraction of it.
+        self.dirty_rect_rendering = False
+        self.dirty_rect_threshold = 0.5
 
         # Ship settings
         self.ship_limit = 3
@@ -17,26 +47,72 @@ class Settings:
         self.bullet_height = 10
         self.bullet_color = (60, 60, 60)
         self.bullets_allowed = 10
+        # Holding the fire key down fires every auto_fire_interval ms.
+        self.auto_fire = True
+        self.auto_fire_interval = 250
 
         # Alien settings
         self.fleet_drop_speed = 10
+        # Move the fleet with NumPy array operations when it is installed.
+        self.vectorized_fleet = True
 
-        # How quickly the game speeds up
-        self.speedup_scale = 1.1
+        # Alien projectile settings; the most projectiles which can be on
+        #   the screen at once, moved with NumPy when it is installed.
+        self.alien_projectile_width = 4
+        self.alien_projectile_height = 12
+        self.alien_projectile_color = (200, 30, 30)
+        self.alien_projectiles_allowed = 5000
+        self.vectorized_projectiles = True
+        self.alien_volley_max = 10
 
-        # How quickly the alien point values increase
-        self.score_scale = 1.5
+        # Every difficulty makes the game speed up and the alien point
+        #   values increase this much quicker than easy.
+        self.difficulty_factors = {"easy": 1, "normal": 1.3, "hard": 1.6}
+        self.set_difficulty("easy")
+
+        # The best scores of every difficulty are kept in a database in the
+        #   user data directory (None), or in memory only (False).
+        self.score_store_path = None
+        self.leaderboard_size = 10
+
+        # The most memory each decoded sound bank may use (None for no cap).
+        self.sound_bank_max_bytes = None
+
+        # Frame profiler; F3 turns it on and off in the game.
+        self.profiler_enabled = False
+        self.profiler_frames = 600
+        self.profiler_csv_path = "frame_profile.csv"
+
+        # Print how long each phase of the startup took.
+        self.startup_report = False
 
         # Explosion animation speed
         self.explosion_long = 20
 
         self.initialize_dynamic_settings()
 
+    def set_difficulty(self, difficulty):
+        """Choose the difficulty by its name."""
+        self.difficulty = difficulty
+        factor = self.difficulty_factors[difficulty]
+
+        # How quickly the game speeds up
+        self.speedup_scale = 1.1 * factor
+
+        # How quickly the alien point values increase
+        self.score_scale = 1.5 * factor
+
     def initialize_dynamic_settings(self):
         """Initialize settings that change throughout the game."""
-        self.ship_speed = 1.5
-        self.bullet_speed = 2.5
-        self.alien_speed = 1.0
+        # Speeds are in pixels per second.
+        self.ship_speed = 90.0
+        self.bullet_speed = 150.0
+        self.alien_speed = 60.0
+        self.alien_projectile_speed = 120.0
+
+        # Every alien_fire_interval ms alien_volley_size aliens fire.
+        self.alien_fire_interval = 1500.0
+        self.alien_volley_size = 1
 
         # fleet_direction of 1 represents right; -1 represents left.
         self.fleet_direction = 1
@@ -49,6 +125,11 @@ class Settings:
         self.ship_speed *= self.speedup_scale
         self.bullet_speed *= self.speedup_scale
         self.alien_speed *= self.speedup_scale
+        self.alien_projectile_speed *= self.speedup_scale
+
+        # The aliens fire more often, and more of them at once.
+        self.alien_fire_interval /= self.speedup_scale
+        self.alien_volley_size = min(self.alien_volley_size + 1, self.alien_volley_max)
 
         self.alien_points = int(self.alien_points * self.score_scale)
 
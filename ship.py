@@ -1,8 +1,5 @@
 import pygame
 from pygame.sprite import Sprite
-from pygame import mixer
-import os
-import random
 
 
 class Ship(Sprite):
@@ -16,7 +13,7 @@ class Ship(Sprite):
         self.screen_rect = ai_game.screen.get_rect()
 
         # Load the ship image and get its rect.
-        self.image = pygame.image.load(ai_game.resource_path("assets/images/ship.bmp"))
+        self.image = ai_game.assets.image("assets/images/ship.bmp")
         self.rect = self.image.get_rect()
 
         # Start each new ship at the bottom center of the screen.
@@ -35,18 +32,15 @@ class Ship(Sprite):
     def update(self):
         """Update the ship's position based on the movement flag."""
         # Update the ship's x value, not the rect
+        step = self.settings.ship_speed * self.settings.time_step
         if self.moving_right and self.rect.right < self.screen_rect.right:
-            self.x += self.settings.ship_speed
+            self.x += step
         if self.moving_left and self.rect.left > 0:
-            self.x -= self.settings.ship_speed
+            self.x -= step
 
         # Update rect object from self.x.
         self.rect.x = self.x
 
-    def blitme(self):
-        """Draw the ship at its current location."""
-        self.screen.blit(self.image, self.rect)
-
     def center_ship(self):
         """Center the ship on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
@@ -54,19 +48,7 @@ class Ship(Sprite):
 
     def play_sound(self):
         """Play a sound when the ship collide with enemy and return sound length."""
-        self.ship_sound = mixer.Sound(
-            self._choose_a_random_sound_file(
-                self.ai_game.resource_path("assets/sounds/ship_hit_sounds")
-            )
-        )
+        self.ship_sound = self.ai_game.ship_hit_sounds.random_sound()
         self.ship_sound.play()
         # Return the time duration of the sound.
         return self.ship_sound.get_length()
-
-    def _choose_a_random_sound_file(self, sound_dir):
-        """This method choose a file randomly from a directory."""
-        dir_path = sound_dir
-        files = os.listdir(dir_path)
-        file_name = random.choice(files)
-        full_path = os.path.join(dir_path, file_name)
-        return full_path
@@ -0,0 +1,138 @@
+import threading
+
+from pygame import mixer
+
+from asset_cache import SilentSound
+
+
+class SoundBank:
+    """A class to decode every sound of a directory on a worker thread."""
+
+    def __init__(self, ai_game, sound_dir, max_bytes=None):
+        """Scan the directory once; call start_loading() to decode it."""
+        self.assets = ai_game.assets
+        self.rng = ai_game.rng
+        self.sound_dir = sound_dir
+        self.max_bytes = max_bytes
+
+        self.files = self.assets.listdir(sound_dir)
+        # The decoded sounds by file name.
+        self.sounds = {}
+        self.nbytes = 0
+
+        self._lock = threading.Lock()
+        self._thread = None
+
+        # The files which random_sound() picks from: as many as fit under
+        #   max_bytes, in sorted order. Without the sizes from the asset
+        #   bundle they are only known once the worker thread has decoded
+        #   them, and are None until then.
+        self.kept = self._fit_from_bundle()
+
+    def _fit_from_bundle(self):
+        """
+        Return the sorted files whose decoded sounds fit under max_bytes,
+        or None if the bundle doesn't know the size of every sound.
+        """
+        if self.max_bytes is None:
+            return list(self.files)
+        kept = []
+        nbytes = 0
+        for file_name in self.files:
+            size = self.assets.sound_bytes(f"{self.sound_dir}/{file_name}")
+            if size is None:
+                return None
+            if nbytes + size > self.max_bytes:
+                break
+            kept.append(file_name)
+            nbytes += size
+        return kept
+
+    def start_loading(self):
+        """Decode the sounds on a daemon thread."""
+        if self._thread is None and mixer.get_init() is not None:
+            self._thread = threading.Thread(target=self._load, daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        """
+        Decode the sounds which haven't been decoded on demand yet, and
+        stop at the first one which doesn't fit under max_bytes.
+        """
+        # The sounds known to fit need no check.
+        capped = self.kept is None
+        files = self.files if capped else self.kept
+        for count, file_name in enumerate(files):
+            with self._lock:
+                if file_name in self.sounds:
+                    continue
+            if self._keep(file_name, self._decode(file_name), capped) is None:
+                files = files[:count]
+                break
+        self.kept = list(files)
+
+    def _decode(self, file_name):
+        """Decode one sound of the directory."""
+        return self.assets.load_sound(f"{self.sound_dir}/{file_name}")
+
+    def _keep(self, file_name, sound, capped=True):
+        """
+        Keep a decoded sound, if it fits under max_bytes when capped is
+        True, and return the sound kept for file_name, or None if there is
+        no room for it.
+        """
+        size = self._sound_bytes(sound)
+        with self._lock:
+            if file_name in self.sounds:
+                # The other thread has decoded it too.
+                return self.sounds[file_name]
+            if (
+                capped
+                and self.max_bytes is not None
+                and self.nbytes + size > self.max_bytes
+            ):
+                return None
+            self.sounds[file_name] = sound
+            self.nbytes += size
+        return sound
+
+    def _sound_bytes(self, sound):
+        """Return the size of a decoded sound in memory."""
+        frequency, size, channels = mixer.get_init()
+        return round(sound.get_length() * frequency) * channels * abs(size) // 8
+
+    def random_sound(self):
+        """
+        Return a random sound of those which fit under max_bytes. The choice
+        only depends on the game's random generator and the sorted file
+        names and sizes, so a replay picks the same sounds; a sound the
+        worker thread hasn't decoded yet is decoded on its own.
+        """
+        if mixer.get_init() is None or not self.files:
+            return SilentSound()
+
+        self.start_loading()
+        if self.kept is None:
+            # Only the worker thread can tell which sounds fit.
+            self._thread.join()
+        if not self.kept:
+            return SilentSound()
+
+        file_name = self.rng.choice(self.kept)
+        with self._lock:
+            sound = self.sounds.get(file_name)
+        if sound is None:
+            sound = self._keep(file_name, self._decode(file_name), capped=False)
+        return sound
+
+    def stats(self):
+        """Return the number of decoded sounds and their memory footprint."""
+        kept = self.kept
+        with self._lock:
+            return {
+                "files": len(self.files),
+                "decoded": len(self.sounds),
+                "skipped": 0 if kept is None else len(self.files) - len(kept),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
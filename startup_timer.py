@@ -0,0 +1,38 @@
+from time import perf_counter
+
+
+class StartupTimer:
+    """A class to time the phases of starting the game."""
+
+    def __init__(self, started):
+        """Start timing at started, a perf_counter() value."""
+        self.started = started
+        self._last = started
+        self.phases = {}
+
+    def lap(self, phase):
+        """Record the time since the last lap as phase."""
+        now = perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    def time_once(self, phase, function):
+        """Call function, timing it as phase the first time it is called."""
+        if phase in self.phases:
+            return function()
+        start = perf_counter()
+        result = function()
+        self.phases[phase] = perf_counter() - start
+        return result
+
+    def elapsed(self):
+        """Return the seconds since the start."""
+        return perf_counter() - self.started
+
+    def report(self, phases=None):
+        """Return the recorded phases (all of them by default) as text in ms."""
+        return "\n".join(
+            f"{phase:<16}{1000 * self.phases[phase]:9.1f} ms"
+            for phase in phases or self.phases
+            if phase in self.phases
+        )
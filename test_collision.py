@@ -0,0 +1,70 @@
+import pytest
+
+from collision import CollisionIndex
+
+
+def expected_collisions(bullets, alien_rects):
+    """
+    Return the hits groupcollide(bullets, aliens, False, True) would find
+    among the (alien, rect) pairs in alien_rects.
+    """
+    alive = list(alien_rects)
+    collisions = {}
+    for bullet in bullets:
+        hit = {alien for alien, rect in alive if bullet.rect.colliderect(rect)}
+        if hit:
+            alive = [(alien, rect) for alien, rect in alive if alien not in hit]
+            collisions[bullet] = hit
+    return collisions
+
+
+@pytest.mark.parametrize("mode", ["arrays", "sprites", "hash"])
+def test_index_matches_groupcollide(monkeypatch, play, aim, alien_rects, mode):
+    if mode == "hash":
+        monkeypatch.setattr(
+            CollisionIndex, "build_grid", lambda self, aliens: self.clear()
+        )
+    ai = play("sprites" if mode == "hash" else mode, seed=5)
+
+    index = ai.collision_index
+    assert (index.ref_alien is None) == (mode == "hash")
+    collide = index.collide
+
+    def checked_collide(bullets, aliens):
+        # Work out the hits from where the aliens are, so the index has to
+        #   bring their rects up to date itself.
+        expected = expected_collisions(bullets, alien_rects(ai))
+        collisions = collide(bullets, aliens)
+        assert {bullet: set(hit) for bullet, hit in collisions.items()} == expected
+        return collisions
+
+    monkeypatch.setattr(index, "collide", checked_collide)
+    for step in range(10000):
+        ai.step(aim(ai))
+
+    assert ai.stats.level >= 3
+
+
+def test_irregular_fleet_falls_back_to_the_hash(play):
+    ai = play("sprites", seed=5)
+    index = ai.collision_index
+    assert index.ref_alien is not None
+
+    # Move an alien off the grid.
+    first, second = ai.aliens.sprites()[:2]
+    first.rect.x += 3
+    index.build_grid(ai.aliens)
+    assert index.ref_alien is None and not index.cells
+
+    # Put two aliens in the same cell.
+    first.rect.topleft = second.rect.topleft
+    index.build_grid(ai.aliens)
+    assert index.ref_alien is None and not index.cells
+
+    # Both aliens can still be shot down.
+    bullets = ai.bullets
+    bullets.empty()
+    bullets.fire(second.rect)
+    bullets.sprites()[0].rect.midtop = second.rect.center
+    collisions = index.collide(bullets, ai.aliens)
+    assert set(collisions[bullets.sprites()[0]]) == {first, second}
@@ -0,0 +1,50 @@
+import pytest
+
+
+def scan_at_edge(ai, rects):
+    """Check the edges alien by alien, like _check_fleet_edges used to."""
+    screen_rect = ai.screen.get_rect()
+    return any(rect.right >= screen_rect.right or rect.left <= 0 for rect in rects)
+
+
+def scan_at_bottom(ai, rects):
+    """Check the bottom alien by alien, like _check_aliens_bottom used to."""
+    screen_rect = ai.screen.get_rect()
+    return any(rect.bottom >= screen_rect.bottom for rect in rects)
+
+
+@pytest.mark.parametrize("fleet", ["arrays", "sprites"])
+def test_bounds_match_a_scan_of_every_alien(play, aim, alien_rects, fleet):
+    # Play long enough to clear many levels, reach the bottom and change
+    #   direction many times; the ship holds its fire now and then to let
+    #   the fleet reach it.
+    ai = play(fleet, seed=3)
+
+    levels = set()
+    edges = 0
+    for step in range(20000):
+        ai.step(aim(ai) if step % 4000 < 3000 else ())
+        levels.add(ai.stats.level)
+
+        # Look at where the aliens are without syncing their rects, so
+        #   the game runs as it would without the test.
+        rects = [rect for alien, rect in alien_rects(ai)]
+        assert ai.fleet_bounds.empty == (not rects)
+        if rects:
+            assert ai.fleet_bounds.at_edge() == scan_at_edge(ai, rects)
+            assert ai.fleet_bounds.at_bottom() == scan_at_bottom(ai, rects)
+            assert ai.fleet_bounds.rect == rects[0].unionall(rects[1:])
+            edges += scan_at_edge(ai, rects)
+
+    assert len(levels) >= 10
+    assert edges > 100
+    assert ai.stats.ships_left < 50
+
+
+@pytest.mark.parametrize("fleet", ["arrays", "sprites"])
+def test_aliens_property_syncs_every_rect(play, aim, alien_rects, fleet):
+    ai = play(fleet, seed=3)
+    for step in range(600):
+        ai.step(aim(ai))
+    expected = alien_rects(ai)
+    assert [alien.rect for alien in ai.aliens] == [rect for alien, rect in expected]
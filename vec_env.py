@@ -0,0 +1,281 @@
+import argparse
+import multiprocessing
+import os
+import sys
+from multiprocessing import shared_memory
+from time import perf_counter
+
+import numpy as np
+
+
+# The actions are bits, so any of them can be combined.
+LEFT = 1
+RIGHT = 2
+FIRE = 4
+
+# What an observation holds; positions are fractions of the screen size.
+OBSERVATION = (
+    "ship_x",
+    "fleet_left",
+    "fleet_right",
+    "fleet_top",
+    "fleet_bottom",
+    "fleet_direction",
+    "aliens",
+    "bullets",
+    "ships_left",
+    "level",
+    "projectiles",
+    "projectile_x",
+    "projectile_y",
+)
+
+
+class SharedArrays:
+    """A class to lay out the actions and results of every game in shared memory."""
+
+    def __init__(self, num_envs, name=None):
+        """Create the shared memory block, or attach to the one called name."""
+        layout = (
+            ("actions", np.uint8, (num_envs,)),
+            ("observations", np.float32, (num_envs, len(OBSERVATION))),
+            ("rewards", np.float32, (num_envs,)),
+            ("dones", np.bool_, (num_envs,)),
+        )
+        offsets = []
+        size = 0
+        for field, dtype, shape in layout:
+            # Align every array to 8 bytes.
+            size = (size + 7) // 8 * 8
+            offsets.append(size)
+            size += np.dtype(dtype).itemsize * int(np.prod(shape))
+
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+
+        for (field, dtype, shape), offset in zip(layout, offsets):
+            array = np.ndarray(shape, dtype, self.memory.buf, offset)
+            setattr(self, field, array)
+
+    def close(self, unlink=False):
+        """Detach from the shared memory, and free it if unlink is True."""
+        # The arrays point into the buffer, which can't close while they do.
+        del self.actions, self.observations, self.rewards, self.dones
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+def observe(ai, out):
+    """Write the observation of a game to out, a row of observations."""
+    width = ai.settings.screen_width
+    height = ai.settings.screen_height
+    bounds = ai.fleet_bounds
+    out[0] = ai.ship.x / width
+    if bounds.empty:
+        out[1:5] = 0.0
+    else:
+        out[1] = bounds.left_x / width
+        out[2] = (bounds.right_x + bounds.alien_width) / width
+        out[3] = bounds.top / height
+        out[4] = bounds.bottom / height
+    out[5] = ai.settings.fleet_direction
+    out[6] = ai.alien_count
+    out[7] = len(ai.bullets)
+    out[8] = ai.stats.ships_left
+    out[9] = ai.stats.level
+    # The alien projectile which is closest to the ship.
+    out[10] = len(ai.alien_fire)
+    nearest = ai.alien_fire.nearest(ai.ship.rect.centerx, ai.ship.rect.centery)
+    if nearest is None:
+        out[11:13] = 0.0
+    else:
+        out[11] = nearest[0] / width
+        out[12] = nearest[1] / height
+
+
+def _worker(connection, name, num_envs, first, last, seeds, size, frame_skip):
+    """Run the games first to last in this process, a step per command."""
+    from alien_invasion import AlienInvasion
+
+    arrays = SharedArrays(num_envs, name)
+    games = [
+        AlienInvasion(headless=True, size=size, render=False, seed=seed)
+        for seed in seeds
+    ]
+
+    def reset(index, ai):
+        ai.state.enter(ai.state.MENU)
+        ai._start_game()
+        observe(ai, arrays.observations[index])
+
+    while True:
+        command = connection.recv()
+        if command == "step":
+            for index, ai in enumerate(games, first):
+                action = arrays.actions[index]
+                actions = set()
+                if action & LEFT:
+                    actions.add("left")
+                if action & RIGHT:
+                    actions.add("right")
+                if action & FIRE:
+                    actions.add("fire")
+
+                score = ai.stats.score
+                for step in range(frame_skip):
+                    active = ai.step(actions)["game_active"]
+                    if not active:
+                        break
+                arrays.rewards[index] = ai.stats.score - score
+                arrays.dones[index] = not active
+                if active:
+                    observe(ai, arrays.observations[index])
+                else:
+                    # Start the next game right away.
+                    reset(index, ai)
+        elif command == "reset":
+            for index, ai in enumerate(games, first):
+                reset(index, ai)
+            arrays.rewards[first:last] = 0.0
+            arrays.dones[first:last] = False
+        elif command == "close":
+            break
+        connection.send(None)
+
+    arrays.close()
+    connection.close()
+
+
+class VecEnv:
+    """
+    A class to play many headless games in a pool of processes, stepping
+    them in lockstep.
+
+    The actions, observations, rewards and dones of every game are NumPy
+    arrays in shared memory; only the one-word commands go through pipes.
+    """
+
+    def __init__(
+        self,
+        num_envs,
+        processes=None,
+        seed=0,
+        size=None,
+        frame_skip=1,
+        start_method="spawn",
+    ):
+        """
+        Start num_envs games, seeded seed, seed + 1, ..., split over
+        processes processes (one per CPU by default). Every step repeats
+        the actions frame_skip time steps.
+        """
+        self.num_envs = num_envs
+        self.processes = min(processes or os.cpu_count() or 1, num_envs)
+        self.arrays = SharedArrays(num_envs)
+
+        # Don't greet from every process.
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        context = multiprocessing.get_context(start_method)
+        self._connections = []
+        self._workers = []
+        for number in range(self.processes):
+            first = number * num_envs // self.processes
+            last = (number + 1) * num_envs // self.processes
+            parent, child = context.Pipe()
+            worker = context.Process(
+                target=_worker,
+                args=(
+                    child,
+                    self.arrays.name,
+                    num_envs,
+                    first,
+                    last,
+                    range(seed + first, seed + last),
+                    size,
+                    frame_skip,
+                ),
+                daemon=True,
+            )
+            worker.start()
+            child.close()
+            self._connections.append(parent)
+            self._workers.append(worker)
+        self.closed = False
+
+    def _command(self, command):
+        """Send a command to every process and wait until they are done."""
+        for connection in self._connections:
+            connection.send(command)
+        for connection in self._connections:
+            connection.recv()
+
+    def reset(self):
+        """Start a new game everywhere and return the observations."""
+        self._command("reset")
+        return self.arrays.observations.copy()
+
+    def step(self, actions):
+        """
+        Apply an action (a combination of LEFT, RIGHT and FIRE) to every game
+        and return the observations, the points scored and whether each game
+        ended; an ended game starts again, and its observation is the new
+        game's.
+        """
+        self.arrays.actions[:] = actions
+        self._command("step")
+        return (
+            self.arrays.observations.copy(),
+            self.arrays.rewards.copy(),
+            self.arrays.dones.copy(),
+        )
+
+    def close(self):
+        """Stop the processes and free the shared memory."""
+        if self.closed:
+            return
+        self.closed = True
+        for connection in self._connections:
+            connection.send("close")
+        for worker in self._workers:
+            worker.join()
+        self.arrays.close(unlink=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    """Measure how many game steps per second a pool of processes runs."""
+    parser = argparse.ArgumentParser(description="Step many headless games at once.")
+    parser.add_argument("--envs", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=[os.cpu_count() or 1],
+        help="pool sizes to compare",
+    )
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    for processes in args.processes:
+        with VecEnv(args.envs, processes) as env:
+            env.reset()
+            start = perf_counter()
+            for step in range(args.steps):
+                env.step(rng.integers(0, 8, args.envs, dtype=np.uint8))
+            seconds = perf_counter() - start
+        print(f"{processes} processes: {args.envs * args.steps / seconds:,.0f} steps/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())